@@ -0,0 +1,62 @@
+"""unique filesystem sync tasks and content items
+
+Revision ID: 003_filesystem_sync_unique_rows
+Revises: 002_add_project_stage
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "003_filesystem_sync_unique_rows"
+down_revision = "002_add_project_stage"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Racing workers could insert the same sync row twice; keep the first.
+    op.execute(
+        """
+        DELETE FROM tasks
+        WHERE source = 'filesystem_sync'
+        AND EXISTS (
+            SELECT 1 FROM tasks kept
+            WHERE kept.source = 'filesystem_sync'
+            AND kept.project_id = tasks.project_id
+            AND kept.title = tasks.title
+            AND kept.id < tasks.id
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM content_items
+        WHERE source = 'filesystem_sync'
+        AND EXISTS (
+            SELECT 1 FROM content_items kept
+            WHERE kept.source = 'filesystem_sync'
+            AND kept.title = content_items.title
+            AND kept.id < content_items.id
+        )
+        """
+    )
+    op.create_index(
+        "uq_tasks_filesystem_sync_project_title",
+        "tasks",
+        ["project_id", "title"],
+        unique=True,
+        postgresql_where=sa.text("source = 'filesystem_sync'"),
+    )
+    op.create_index(
+        "uq_content_items_filesystem_sync_title",
+        "content_items",
+        ["title"],
+        unique=True,
+        postgresql_where=sa.text("source = 'filesystem_sync'"),
+    )
+
+
+def downgrade():
+    op.drop_index("uq_content_items_filesystem_sync_title", table_name="content_items")
+    op.drop_index("uq_tasks_filesystem_sync_project_title", table_name="tasks")
@@ -0,0 +1,78 @@
+"""add indexed project filesystem_path
+
+Revision ID: 004_project_filesystem_path
+Revises: 003_filesystem_sync_unique_rows
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "004_project_filesystem_path"
+down_revision = "003_filesystem_sync_unique_rows"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("projects", sa.Column("filesystem_path", sa.String(), nullable=True))
+    # Keep the lowest id per path; tasks of duplicate projects move onto it
+    # and the duplicates keep a NULL filesystem_path. Duplicates carry the
+    # same generated sync tasks, so first drop every filesystem_sync task
+    # that would collide on the kept project under the index from 003: one
+    # already on the kept project wins, otherwise the lowest id.
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT id, MIN(id) OVER (PARTITION BY meta ->> 'filesystem_path') AS keep_id
+            FROM projects
+            WHERE meta ->> 'filesystem_path' IS NOT NULL
+        )
+        DELETE FROM tasks
+        WHERE source = 'filesystem_sync'
+        AND project_id IN (SELECT id FROM ranked WHERE id <> keep_id)
+        AND EXISTS (
+            SELECT 1
+            FROM tasks kept
+            JOIN ranked kept_project ON kept_project.id = kept.project_id
+            JOIN ranked own_project ON own_project.id = tasks.project_id
+            WHERE kept.source = 'filesystem_sync'
+            AND kept.title = tasks.title
+            AND kept.id <> tasks.id
+            AND kept_project.keep_id = own_project.keep_id
+            AND (kept.project_id = kept_project.keep_id OR kept.id < tasks.id)
+        )
+        """
+    )
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT id, MIN(id) OVER (PARTITION BY meta ->> 'filesystem_path') AS keep_id
+            FROM projects
+            WHERE meta ->> 'filesystem_path' IS NOT NULL
+        )
+        UPDATE tasks
+        SET project_id = ranked.keep_id
+        FROM ranked
+        WHERE tasks.project_id = ranked.id
+        AND ranked.id <> ranked.keep_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE projects
+        SET filesystem_path = meta ->> 'filesystem_path'
+        WHERE meta ->> 'filesystem_path' IS NOT NULL
+        AND id = (
+            SELECT MIN(other.id)
+            FROM projects other
+            WHERE other.meta ->> 'filesystem_path' = projects.meta ->> 'filesystem_path'
+        )
+        """
+    )
+    op.create_index("uq_projects_filesystem_path", "projects", ["filesystem_path"], unique=True)
+
+
+def downgrade():
+    op.drop_index("uq_projects_filesystem_path", table_name="projects")
+    op.drop_column("projects", "filesystem_path")
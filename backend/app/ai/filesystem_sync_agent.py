@@ -13,17 +13,49 @@ class ProjectSummary:
     tags: List[str]
 
 
-def _guess_tech_type(files: List[str]) -> str:
-    if "package.json" in files:
+MARKER_FILES = {"package.json", "pyproject.toml", "requirements.txt", "README.md"}
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac")
+
+
+def features_from_files(files: List[str]) -> Dict[str, Any]:
+    ext: Dict[str, int] = {}
+    markers = set()
+    has_tests = has_master = has_mix = False
+    for path in files:
+        suffix = os.path.splitext(path)[1].lower()
+        ext[suffix] = ext.get(suffix, 0) + 1
+        if path in MARKER_FILES:
+            markers.add(path)
+        lowered = path.lower()
+        has_tests = has_tests or "tests" in path
+        has_master = has_master or "master" in lowered
+        has_mix = has_mix or "mix" in lowered
+    return {
+        "file_count": len(files),
+        "ext": ext,
+        "markers": sorted(markers),
+        "has_tests": has_tests,
+        "has_master": has_master,
+        "has_mix": has_mix,
+    }
+
+
+def _has_ext(features: Dict[str, Any], extensions: tuple) -> bool:
+    return any(features["ext"].get(suffix) for suffix in extensions)
+
+
+def _guess_tech_type(features: Dict[str, Any]) -> str:
+    markers = features["markers"]
+    if "package.json" in markers:
         return "web_app"
-    if "pyproject.toml" in files or "requirements.txt" in files:
+    if "pyproject.toml" in markers or "requirements.txt" in markers:
         return "python_app"
-    if any(name.endswith(('.sh', '.ps1')) for name in files):
+    if _has_ext(features, (".sh", ".ps1")):
         return "tool"
     return "code_project"
 
 
-def _guess_records_type(files: List[str], name: str) -> str:
+def _guess_records_type(features: Dict[str, Any], name: str) -> str:
     lower = name.lower()
     if "album" in lower:
         return "album"
@@ -31,42 +63,43 @@ def _guess_records_type(files: List[str], name: str) -> str:
         return "ep"
     if "pack" in lower:
         return "beat_pack"
-    if any(f.endswith(".mid") or f.endswith(".midi") for f in files):
+    if _has_ext(features, (".mid", ".midi")):
         return "song"
     return "song"
 
 
-def _guess_records_status(files: List[str]) -> str:
-    lowered = [f.lower() for f in files]
-    if any("master" in f for f in lowered):
+def _guess_records_status(features: Dict[str, Any]) -> str:
+    if features["has_master"]:
         return "ready_for_release"
-    if any("mix" in f for f in lowered):
+    if features["has_mix"]:
         return "mix"
-    if any(f.endswith((".wav", ".mp3", ".flac")) for f in lowered):
+    if _has_ext(features, AUDIO_EXTENSIONS):
         return "production"
     return "idea"
 
 
-def _guess_tech_status(files: List[str]) -> str:
-    if "README.md" in files and any("tests" in f for f in files):
+def _guess_tech_status(features: Dict[str, Any]) -> str:
+    if "README.md" in features["markers"] and features["has_tests"]:
         return "ready_for_demo"
-    if "README.md" in files:
+    if "README.md" in features["markers"]:
         return "wip"
     return "prototype"
 
 
+# Classifies from the compact feature record the scanner builds while
+# walking; descriptors that only carry a file list are reduced first.
 def interpret_change(descriptor: Dict[str, Any], change_type: str) -> Dict[str, Any]:
-    files = descriptor.get("files", [])
+    features = descriptor.get("features") or features_from_files(descriptor.get("files", []))
     name = descriptor.get("name")
     brand = descriptor.get("brand")
 
     if brand == "tech":
-        project_type = _guess_tech_type(files)
-        status = _guess_tech_status(files)
+        project_type = _guess_tech_type(features)
+        status = _guess_tech_status(features)
         tags = [project_type, "automation", "ai"]
         description = f"Tech project inferred from filesystem ({project_type})."
         tasks = []
-        if "README.md" not in files:
+        if "README.md" not in features["markers"]:
             tasks.append(
                 {
                     "title": "Add README for project",
@@ -74,7 +107,7 @@ def interpret_change(descriptor: Dict[str, Any], change_type: str) -> Dict[str,
                     "priority": "medium",
                 }
             )
-        if not any("tests" in f for f in files):
+        if not features["has_tests"]:
             tasks.append(
                 {
                     "title": "Add minimal tests",
@@ -93,8 +126,8 @@ def interpret_change(descriptor: Dict[str, Any], change_type: str) -> Dict[str,
                 }
             )
     else:
-        project_type = _guess_records_type(files, name)
-        status = _guess_records_status(files)
+        project_type = _guess_records_type(features, name)
+        status = _guess_records_status(features)
         tags = [project_type, "records"]
         description = f"Records project inferred from filesystem ({project_type})."
         tasks = []
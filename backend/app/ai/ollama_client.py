@@ -1,4 +1,3 @@
-import httpx
 from typing import Optional
 from ..config import settings
 
@@ -10,6 +9,8 @@ def generate(prompt: str, model: Optional[str] = None) -> str:
         "stream": False,
     }
     try:
+        import httpx
+
         response = httpx.post(f"{settings.ollama_host}/api/generate", json=payload, timeout=20)
         response.raise_for_status()
         data = response.json()
@@ -1,8 +1,8 @@
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 from sqlalchemy.orm import Session
-from langgraph.graph import StateGraph
 from ..services.ai_run_service import start_ai_run, complete_ai_run
 from ..services.audit_service import write_audit_log
 from .ollama_client import generate
@@ -56,7 +56,13 @@ def _router(state: dict) -> dict:
     return state
 
 
+# langgraph takes most of a second to import, so it is loaded and the graph
+# compiled on the first ingest instead of at API startup; the compiled graph
+# is reused afterwards.
+@lru_cache(maxsize=1)
 def _build_graph():
+    from langgraph.graph import StateGraph
+
     graph = StateGraph(dict)
     graph.add_node("route", _router)
     graph.set_entry_point("route")
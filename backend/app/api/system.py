@@ -4,7 +4,8 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..auth.deps import require_admin
-from ..services.filesystem_sync import run_filesystem_sync
+from ..services.filesystem_sync import run_filesystem_sync_job
+from ..services.job_runner import job_runner
 from ..services.n8n_sync import sync_n8n_workflows
 from ..services.audit_service import write_audit_log
 from ..metrics import record_workflow_event
@@ -33,9 +34,23 @@ class MockSeedRequest(BaseModel):
     force: bool = False
 
 
-@router.post("/run_filesystem_sync")
-def run_sync(db: Session = Depends(get_db), user=Depends(require_admin)):
-    return run_filesystem_sync(db)
+@router.post("/run_filesystem_sync", status_code=status.HTTP_202_ACCEPTED)
+def run_sync(user=Depends(require_admin)):
+    job = job_runner.submit_unique("filesystem_sync", run_filesystem_sync_job)
+    return job.to_dict()
+
+
+@router.get("/jobs")
+def list_jobs(user=Depends(require_admin)):
+    return job_runner.list_jobs()
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str, user=Depends(require_admin)):
+    job = job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job.to_dict()
 
 
 @router.post("/sync_n8n_workflows")
@@ -1,19 +1,24 @@
 from datetime import datetime, timedelta
 from jose import jwt
-from passlib.context import CryptContext
+from functools import lru_cache
 from ..config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 ALGORITHM = "HS256"
 
 
+@lru_cache(maxsize=1)
+def pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+    return pwd_context().verify(password, hashed_password)
 
 
 def create_access_token(subject: str, role: str, expires_minutes: int = 60 * 24) -> str:
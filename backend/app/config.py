@@ -16,9 +16,30 @@ class Settings(BaseSettings):
 
     jwt_secret: str
     log_level: str = "INFO"
+    log_mode: str = "sync"
+    log_queue_size: int = 10_000
+    log_queue_policy: str = "drop"
+    log_file: str | None = None
+    log_file_max_bytes: int = 50 * 1024 * 1024
+    log_file_backup_count: int = 5
     frontend_url: str
+    metrics_refresh_seconds: float = 30.0
+    metrics_path_label_limit: int = 200
+    server_timing_header: bool = False
+    rate_limit_backend: str = "memory"
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    rate_limit_max_keys: int = 10_000
     fs_sync_root: str = "/app/projects"
     fs_sync_interval_minutes: int = 15
+    fs_sync_scan_workers: int = 8
+    fs_sync_prune_unchanged_dirs: bool = False
+    fs_sync_mode: str = "interval"
+    fs_sync_watch_backend: str = "auto"
+    fs_sync_watch_poll_seconds: float = 2.0
+    fs_sync_watch_polling_interval_seconds: float = 300.0
+    fs_sync_debounce_seconds: float = 0.0
+    fs_sync_fingerprint_mode: str = "metadata"
+    fs_sync_content_full_hash_bytes: int = 1024 * 1024
 
     model_config = SettingsConfigDict(env_prefix="", case_sensitive=False)
 
@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
+from .db_stats import instrument_engine
 
 
 def _normalize_db_url(url: str) -> str:
@@ -14,6 +15,7 @@ if settings.test_database_url:
     DATABASE_URL = _normalize_db_url(settings.test_database_url)
 
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
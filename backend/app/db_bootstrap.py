@@ -1,5 +1,9 @@
+import hashlib
+import zlib
+
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
 
 
 SCHEMA_SQL = [
@@ -21,6 +25,7 @@ SCHEMA_SQL = [
         stage TEXT,
         status TEXT NOT NULL,
         priority TEXT NOT NULL,
+        filesystem_path TEXT,
         meta JSONB DEFAULT '{}'::jsonb,
         created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
         updated_at TIMESTAMPTZ
@@ -111,54 +116,209 @@ SCHEMA_SQL = [
     """,
 ]
 
+# Racing workers could create several projects for one path before the
+# unique index existed: keep the lowest id, move tasks onto it, clear the
+# column on the others and backfill it from meta for kept rows only. Sync
+# tasks the kept project already has are dropped first, since the tasks
+# index may exist from an earlier boot.
+PROJECT_PATH_DEDUPE_SQL = [
+    """
+    WITH ranked AS (
+        SELECT id, MIN(id) OVER (PARTITION BY COALESCE(filesystem_path, meta ->> 'filesystem_path')) AS keep_id
+        FROM projects
+        WHERE COALESCE(filesystem_path, meta ->> 'filesystem_path') IS NOT NULL
+    )
+    DELETE FROM tasks
+    WHERE source = 'filesystem_sync'
+    AND project_id IN (SELECT id FROM ranked WHERE id <> keep_id)
+    AND EXISTS (
+        SELECT 1
+        FROM tasks kept
+        JOIN ranked kept_project ON kept_project.id = kept.project_id
+        JOIN ranked own_project ON own_project.id = tasks.project_id
+        WHERE kept.source = 'filesystem_sync'
+        AND kept.title = tasks.title
+        AND kept.id <> tasks.id
+        AND kept_project.keep_id = own_project.keep_id
+        AND (kept.project_id = kept_project.keep_id OR kept.id < tasks.id)
+    );
+    """,
+    """
+    WITH ranked AS (
+        SELECT id, MIN(id) OVER (PARTITION BY COALESCE(filesystem_path, meta ->> 'filesystem_path')) AS keep_id
+        FROM projects
+        WHERE COALESCE(filesystem_path, meta ->> 'filesystem_path') IS NOT NULL
+    )
+    UPDATE tasks
+    SET project_id = ranked.keep_id
+    FROM ranked
+    WHERE tasks.project_id = ranked.id
+    AND ranked.id <> ranked.keep_id;
+    """,
+    """
+    WITH ranked AS (
+        SELECT id, MIN(id) OVER (PARTITION BY COALESCE(filesystem_path, meta ->> 'filesystem_path')) AS keep_id
+        FROM projects
+        WHERE COALESCE(filesystem_path, meta ->> 'filesystem_path') IS NOT NULL
+    )
+    UPDATE projects
+    SET filesystem_path = NULL
+    FROM ranked
+    WHERE projects.id = ranked.id
+    AND ranked.id <> ranked.keep_id
+    AND projects.filesystem_path IS NOT NULL;
+    """,
+    """
+    UPDATE projects
+    SET filesystem_path = meta ->> 'filesystem_path'
+    WHERE filesystem_path IS NULL
+    AND meta ->> 'filesystem_path' IS NOT NULL
+    AND id = (
+        SELECT MIN(other.id)
+        FROM projects other
+        WHERE COALESCE(other.filesystem_path, other.meta ->> 'filesystem_path') = projects.meta ->> 'filesystem_path'
+    );
+    """,
+]
 
-def create_schema_if_needed(engine: Engine) -> None:
-    with engine.begin() as connection:
-        for statement in SCHEMA_SQL:
-            connection.execute(text(statement))
+# The old check-then-insert in the sync was racy across workers, so keep
+# only the first filesystem_sync task per (project, title) and content item
+# per title before the partial unique indexes are built.
+SYNC_ROW_DEDUPE_SQL = [
+    """
+    DELETE FROM tasks
+    WHERE source = 'filesystem_sync'
+    AND EXISTS (
+        SELECT 1 FROM tasks kept
+        WHERE kept.source = 'filesystem_sync'
+        AND kept.project_id = tasks.project_id
+        AND kept.title = tasks.title
+        AND kept.id < tasks.id
+    );
+    """,
+    """
+    DELETE FROM content_items
+    WHERE source = 'filesystem_sync'
+    AND EXISTS (
+        SELECT 1 FROM content_items kept
+        WHERE kept.source = 'filesystem_sync'
+        AND kept.title = content_items.title
+        AND kept.id < content_items.id
+    );
+    """,
+]
 
-        connection.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS stage TEXT;"))
-        connection.execute(text("ALTER TABLE ideas ADD COLUMN IF NOT EXISTS meta JSONB DEFAULT '{}'::jsonb;"))
-        connection.execute(text("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS meta JSONB DEFAULT '{}'::jsonb;"))
-        connection.execute(text("ALTER TABLE content_items ADD COLUMN IF NOT EXISTS meta JSONB DEFAULT '{}'::jsonb;"))
-        connection.execute(text("ALTER TABLE ai_runs ADD COLUMN IF NOT EXISTS meta JSONB DEFAULT '{}'::jsonb;"))
-        connection.execute(text("ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS details JSONB DEFAULT '{}'::jsonb;"))
-        connection.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS hashed_password TEXT;"))
-        connection.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS role TEXT;"))
+MIGRATION_SQL = [
+    "ALTER TABLE projects ADD COLUMN IF NOT EXISTS stage TEXT;",
+    "ALTER TABLE projects ADD COLUMN IF NOT EXISTS filesystem_path TEXT;",
+    "ALTER TABLE ideas ADD COLUMN IF NOT EXISTS meta JSONB DEFAULT '{}'::jsonb;",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS meta JSONB DEFAULT '{}'::jsonb;",
+    "ALTER TABLE content_items ADD COLUMN IF NOT EXISTS meta JSONB DEFAULT '{}'::jsonb;",
+    "ALTER TABLE ai_runs ADD COLUMN IF NOT EXISTS meta JSONB DEFAULT '{}'::jsonb;",
+    "ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS details JSONB DEFAULT '{}'::jsonb;",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS hashed_password TEXT;",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS role TEXT;",
+    *PROJECT_PATH_DEDUPE_SQL,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_projects_filesystem_path
+    ON projects (filesystem_path);
+    """,
+    *SYNC_ROW_DEDUPE_SQL,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_tasks_filesystem_sync_project_title
+    ON tasks (project_id, title)
+    WHERE source = 'filesystem_sync';
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_content_items_filesystem_sync_title
+    ON content_items (title)
+    WHERE source = 'filesystem_sync';
+    """,
+    """
+    INSERT INTO brands (name, slug)
+    SELECT '43v3r Technology', 'tech'
+    WHERE NOT EXISTS (SELECT 1 FROM brands WHERE slug = 'tech');
+    """,
+    """
+    UPDATE brands
+    SET slug = 'tech'
+    WHERE slug = '43v3r_technology';
+    """,
+    """
+    INSERT INTO brands (name, slug)
+    SELECT '43v3r Records', 'records'
+    WHERE NOT EXISTS (SELECT 1 FROM brands WHERE slug = 'records');
+    """,
+    """
+    UPDATE brands
+    SET slug = 'records'
+    WHERE slug = '43v3r_records';
+    """,
+]
 
+
+# Every statement is idempotent, so a changed list is simply re-applied.
+BOOTSTRAP_SQL = SCHEMA_SQL + MIGRATION_SQL
+
+SCHEMA_META_SQL = """
+CREATE TABLE IF NOT EXISTS schema_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+SCHEMA_HASH_KEY = "schema_hash"
+BOOTSTRAP_LOCK_KEY = zlib.crc32(b"43v3r:db_bootstrap")
+BOOTSTRAP_LOCK_TIMEOUT = "60s"
+
+
+def schema_hash() -> str:
+    digest = hashlib.sha256()
+    for statement in BOOTSTRAP_SQL:
+        digest.update(" ".join(statement.split()).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _applied_hash(connection: Connection) -> str | None:
+    return connection.execute(
+        text("SELECT value FROM schema_meta WHERE key = :key"), {"key": SCHEMA_HASH_KEY}
+    ).scalar()
+
+
+def _read_applied_hash(engine: Engine) -> str | None:
+    with engine.connect() as connection:
+        try:
+            return _applied_hash(connection)
+        except (ProgrammingError, OperationalError):
+            # No schema_meta yet; a down database fails again below.
+            return None
+
+
+# Boot costs one SELECT when schema_meta already holds the hash of
+# BOOTSTRAP_SQL. Otherwise the first worker takes a transaction-level
+# advisory lock and applies the DDL; the others wait on the lock (up to
+# BOOTSTRAP_LOCK_TIMEOUT), re-check the hash and skip. Returns whether DDL ran.
+def create_schema_if_needed(engine: Engine) -> bool:
+    expected = schema_hash()
+    if _read_applied_hash(engine) == expected:
+        return False
+    with engine.begin() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execute(text(f"SET LOCAL lock_timeout = '{BOOTSTRAP_LOCK_TIMEOUT}'"))
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+        connection.execute(text(SCHEMA_META_SQL))
+        if _applied_hash(connection) == expected:
+            return False
+        for statement in BOOTSTRAP_SQL:
+            connection.execute(text(statement))
         connection.execute(
             text(
                 """
-                INSERT INTO brands (name, slug)
-                SELECT '43v3r Technology', 'tech'
-                WHERE NOT EXISTS (SELECT 1 FROM brands WHERE slug = 'tech');
-                """
-            )
-        )
-        connection.execute(
-            text(
-                """
-                UPDATE brands
-                SET slug = 'tech'
-                WHERE slug = '43v3r_technology';
-                """
-            )
-        )
-        connection.execute(
-            text(
-                """
-                INSERT INTO brands (name, slug)
-                SELECT '43v3r Records', 'records'
-                WHERE NOT EXISTS (SELECT 1 FROM brands WHERE slug = 'records');
-                """
-            )
-        )
-        connection.execute(
-            text(
-                """
-                UPDATE brands
-                SET slug = 'records'
-                WHERE slug = '43v3r_records';
+                INSERT INTO schema_meta (key, value) VALUES (:key, :value)
+                ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP;
                 """
-            )
+            ),
+            {"key": SCHEMA_HASH_KEY, "value": expected},
         )
+    return True
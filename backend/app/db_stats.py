@@ -0,0 +1,64 @@
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class RequestDbStats:
+    correlation_id: str
+    queries: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration_seconds * 1000, 3)
+
+
+# The middleware sets a mutable stats object before calling the app. Sync
+# endpoints run in a threadpool with a copy of the request context, which
+# still holds the same object, so the engine hooks add to it from any thread.
+_current: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+def track_request(correlation_id: str) -> tuple[RequestDbStats, Token]:
+    stats = RequestDbStats(correlation_id)
+    return stats, _current.set(stats)
+
+
+def stop_tracking(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[RequestDbStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.duration_seconds += time.perf_counter() - start
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+# Queries outside a request (background jobs, startup) are not counted.
+def instrument_engine(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -1,8 +1,32 @@
+import atexit
 import json
 import logging
+import queue
 import sys
-from datetime import datetime
-from typing import Any, Dict
+import threading
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+LOG_BATCH_SIZE = 256
+
+
+# orjson is stricter than json about keys; OPT_NON_STR_KEYS keeps int keys
+# working, and anything orjson still rejects goes through json instead.
+def dumps(payload: Dict[str, Any]) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(payload, default=str)
 
 
 class JsonFormatter(logging.Formatter):
@@ -10,11 +34,175 @@ class JsonFormatter(logging.Formatter):
         payload: Dict[str, Any] = {
             "level": record.levelname,
             "message": record.getMessage(),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat(),
         }
         if hasattr(record, "extra") and isinstance(record.extra, dict):
             payload.update(record.extra)
-        return json.dumps(payload)
+        return dumps(payload)
+
+
+_file_handler: Optional[RotatingFileHandler] = None
+_handlers_lock = threading.Lock()
+
+
+# One handler per process for LOG_FILE, shared by every logger, so rollover
+# is never raced by two handlers on the same file.
+def _rotating_file_handler() -> RotatingFileHandler:
+    global _file_handler
+    if _file_handler is None:
+        _file_handler = RotatingFileHandler(
+            settings.log_file,
+            maxBytes=settings.log_file_max_bytes,
+            backupCount=settings.log_file_backup_count,
+            encoding="utf-8",
+        )
+        _file_handler.setFormatter(JsonFormatter())
+    return _file_handler
+
+
+# Hands records to one writer thread through a bounded queue, so encoding
+# and stdout/file writes stay off the request path. When the queue is full
+# the "drop" policy discards the record and counts it; "block" waits for
+# the writer. Drops are reported by the writer as a log_records_dropped line;
+# records that fail to encode are counted in format_errors and skipped.
+class QueueJsonHandler(logging.Handler):
+    def __init__(
+        self,
+        stream=None,
+        file_handler: Optional[RotatingFileHandler] = None,
+        maxsize: int = 10_000,
+        policy: str = "drop",
+        batch_size: int = LOG_BATCH_SIZE,
+    ):
+        super().__init__()
+        if policy not in ("drop", "block"):
+            raise ValueError(f"unknown log queue policy {policy}")
+        self.stream = stream if stream is not None else sys.stdout
+        self.file_handler = file_handler
+        self.policy = policy
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.format_errors = 0
+        self._reported_dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue(maxsize)
+        self.setFormatter(JsonFormatter())
+        self._thread = threading.Thread(target=self._run, name="json-log-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Resolve the message now; args may be mutated after the call returns.
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        if self.policy == "block":
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _next_batch(self) -> List[Optional[logging.LogRecord]]:
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            lines = []
+            for record in batch:
+                if record is None:
+                    continue
+                # A record that cannot be encoded must not kill the writer.
+                try:
+                    lines.append(self.format(record))
+                except Exception:
+                    self.format_errors += 1
+                    self.handleError(record)
+            dropped = self.dropped
+            if dropped != self._reported_dropped:
+                lines.append(
+                    dumps(
+                        {
+                            "level": "WARNING",
+                            "message": "log_records_dropped",
+                            "timestamp": datetime.utcnow().isoformat(),
+                            "dropped_total": dropped,
+                            "dropped_since_last": dropped - self._reported_dropped,
+                        }
+                    )
+                )
+                self._reported_dropped = dropped
+            if lines:
+                self._write(lines)
+            if batch[-1] is None:
+                return
+
+    def _write(self, lines: List[str]) -> None:
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+        if self.file_handler is not None:
+            try:
+                self._write_file(lines)
+            except (OSError, ValueError):
+                pass
+
+    # Rolls over between lines, as RotatingFileHandler does per record, but
+    # writes each file's share of the batch in one call.
+    def _write_file(self, lines: List[str]) -> None:
+        handler = self.file_handler
+        chunk: List[str] = []
+        size = handler.stream.tell()
+        for line in lines:
+            length = len(line.encode("utf-8")) + 1
+            if handler.maxBytes and size + length > handler.maxBytes and size:
+                if chunk:
+                    handler.stream.write("".join(chunk))
+                    chunk = []
+                handler.doRollover()
+                size = 0
+            chunk.append(line + "\n")
+            size += length
+        handler.stream.write("".join(chunk))
+        handler.stream.flush()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self.file_handler is not None:
+            self.file_handler.close()
+        super().close()
+
+
+_queue_handler: Optional[QueueJsonHandler] = None
+
+
+def queue_handler() -> QueueJsonHandler:
+    global _queue_handler
+    with _handlers_lock:
+        if _queue_handler is None:
+            _queue_handler = QueueJsonHandler(
+                file_handler=_rotating_file_handler() if settings.log_file else None,
+                maxsize=settings.log_queue_size,
+                policy=settings.log_queue_policy,
+            )
+            atexit.register(_queue_handler.close)
+        return _queue_handler
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -22,8 +210,14 @@ def get_logger(name: str) -> logging.Logger:
     if logger.handlers:
         return logger
     logger.setLevel(logging.INFO)
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JsonFormatter())
-    logger.addHandler(handler)
+    if settings.log_mode == "queue":
+        logger.addHandler(queue_handler())
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonFormatter())
+        logger.addHandler(handler)
+        if settings.log_file:
+            with _handlers_lock:
+                logger.addHandler(_rotating_file_handler())
     logger.propagate = False
     return logger
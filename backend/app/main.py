@@ -1,32 +1,39 @@
-import uuid
+from .startup_profile import startup_profile  # first, so the boot profile covers every import below
+
 import asyncio
 import time
-from datetime import datetime, timedelta
-from fastapi import FastAPI, Request, HTTPException, status, Response
+from pathlib import Path
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import ProgrammingError, OperationalError
+from sqlalchemy.exc import IntegrityError, ProgrammingError, OperationalError
 from .config import settings
 from .database import SessionLocal, engine
 from .logging.json_logger import get_logger
-from .metrics import record_request, render_metrics, METRICS_CONTENT_TYPE
+from .metrics import METRICS_CONTENT_TYPE, refresh_db_gauges, render_metrics
+from .middleware import RequestMiddleware
 from .services.brand_service import ensure_brands
 from .auth.security import hash_password
 from .models import User
-from .api import ideas, tasks, logs, ai, summary, auth, system, health
-from .services.filesystem_sync import run_filesystem_sync
+from .services.filesystem_sync import run_filesystem_sync_job
+from .services.job_runner import job_runner
+from .services.change_debounce import change_debouncer
+from .services.filesystem_watcher import FilesystemWatcher
+from .services.rate_limiter import load_rate_limiter
+from .services.sync_coordination import LeaderElection
 from .db_bootstrap import create_schema_if_needed
 
 logger = get_logger("api")
 
+# Routers are imported one by one so the boot profile shows which ones are slow.
+api = {
+    name: startup_profile.import_module(f"{__package__}.api.{name}")
+    for name in ("auth", "ideas", "tasks", "logs", "ai", "summary", "system", "health")
+}
+
 app = FastAPI(title="43v3r AI OS")
 
-# Simple in-memory rate limiter (dev only)
-RATE_LIMITS = {
-    "/ideas": 30,
-    "/auth/login": 10,
-}
-_rate_state: dict[str, dict[str, dict[str, datetime | int]]] = {}
+rate_limiter = load_rate_limiter()
 
 allowed_origins = [settings.frontend_url] if settings.frontend_url else []
 for fallback in ["http://localhost:3000", "http://127.0.0.1:3000"]:
@@ -40,94 +47,159 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestMiddleware, rate_limiter=rate_limiter)
 
 
-@app.middleware("http")
-async def request_logger(request: Request, call_next):
-    ip = request.client.host if request.client else "unknown"
-    path = request.url.path
-    limit = RATE_LIMITS.get(path)
-    if limit:
-        window = timedelta(minutes=1)
-        key = f"{ip}:{path}"
-        state = _rate_state.get(key, {"count": 0, "reset": datetime.utcnow() + window})
-        if datetime.utcnow() > state["reset"]:
-            state = {"count": 0, "reset": datetime.utcnow() + window}
-        state["count"] += 1
-        _rate_state[key] = state
-        if state["count"] > limit:
-            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Rate limit exceeded")
-
-    correlation_id = request.headers.get("x-correlation-id", str(uuid.uuid4()))
-    request.state.correlation_id = correlation_id
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    duration = time.perf_counter() - start_time
-    logger.info(
-        "request",
-        extra={
-            "extra": {
-                "correlation_id": correlation_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-            }
-        },
-    )
-    record_request(request.method, request.url.path, response.status_code, duration)
-    response.headers["x-correlation-id"] = correlation_id
-    return response
-
-
-@app.on_event("startup")
-def startup_seed():
+# Seed data is not needed to serve requests, so ensure_brands and the bcrypt
+# hash for the default admin run after startup, off the event loop.
+def seed_reference_data():
     db: Session = SessionLocal()
     try:
-        try:
-            create_schema_if_needed(engine)
+        with startup_profile.step("deferred", "ensure_brands"):
             ensure_brands(db)
+        with startup_profile.step("deferred", "seed_admin"):
             existing = db.query(User).count()
             if not existing:
                 user = User(username="admin", hashed_password=hash_password("admin"), role="admin")
                 db.add(user)
                 db.commit()
-        except (ProgrammingError, OperationalError) as exc:
-            logger.info(
-                "startup_seed_skipped",
-                extra={"extra": {"reason": "db_not_ready", "error": str(exc)}},
-            )
+    except (ProgrammingError, OperationalError) as exc:
+        logger.info(
+            "startup_seed_skipped",
+            extra={"extra": {"reason": "db_not_ready", "error": str(exc)}},
+        )
     finally:
         db.close()
 
 
-app.include_router(auth.router)
-app.include_router(ideas.router)
-app.include_router(tasks.router)
-app.include_router(logs.router)
-app.include_router(ai.router)
-app.include_router(ai.router, prefix="/api")
-app.include_router(summary.router)
-app.include_router(system.router)
-app.include_router(system.router, prefix="/api")
-app.include_router(health.router)
+async def run_deferred_startup():
+    await asyncio.to_thread(seed_reference_data)
+    logger.info("startup_profile", extra={"extra": {"phase": "deferred", **startup_profile.report(["deferred"])}})
 
 
 @app.on_event("startup")
+@startup_profile.hook
+async def startup_seed():
+    try:
+        create_schema_if_needed(engine)
+    except (ProgrammingError, OperationalError) as exc:
+        logger.info(
+            "startup_seed_skipped",
+            extra={"extra": {"reason": "db_not_ready", "error": str(exc)}},
+        )
+        return
+    except IntegrityError as exc:
+        logger.error(
+            "startup_seed_skipped",
+            extra={"extra": {"reason": "schema_bootstrap_failed", "error": str(exc)}},
+        )
+        return
+    app.state.deferred_startup = asyncio.create_task(run_deferred_startup())
+
+
+app.include_router(api["auth"].router)
+app.include_router(api["ideas"].router)
+app.include_router(api["tasks"].router)
+app.include_router(api["logs"].router)
+app.include_router(api["ai"].router)
+app.include_router(api["ai"].router, prefix="/api")
+app.include_router(api["summary"].router)
+app.include_router(api["system"].router)
+app.include_router(api["system"].router, prefix="/api")
+app.include_router(api["health"].router)
+
+
+@app.on_event("startup")
+@startup_profile.hook
 async def start_filesystem_sync_loop():
     interval = max(settings.fs_sync_interval_minutes, 1)
+    leader = LeaderElection(engine)
+    app.state.filesystem_sync_leader = leader
+
+    async def is_leader() -> bool:
+        return await asyncio.to_thread(leader.ensure)
+
+    # Full scans coalesce onto an in-flight scheduled sync; dirty-path runs
+    # carry watcher state that a running scan may already have passed, so
+    # they queue. The debounced key keeps manual (flushing) triggers apart.
+    async def sync_once(dirty_paths=None):
+        if dirty_paths is None:
+            job = job_runner.submit_unique(
+                "filesystem_sync",
+                run_filesystem_sync_job,
+                dirty_paths,
+                debounce=True,
+                coalesce_key="filesystem_sync:debounced",
+            )
+        else:
+            job = job_runner.submit("filesystem_sync", run_filesystem_sync_job, dirty_paths, debounce=True)
+        await asyncio.wrap_future(job.future)
+        return job
+
+    async def sleep_flushing_debounced(seconds: float):
+        deadline = time.monotonic() + seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            due_in = change_debouncer.next_due_in()
+            if due_in is None or due_in >= remaining:
+                await asyncio.sleep(remaining)
+                return
+            await asyncio.sleep(max(due_in, 1.0))
+            await sync_once({})
 
     async def loop():
         while True:
-            db = SessionLocal()
-            try:
-                run_filesystem_sync(db)
-            except Exception:
-                pass
-            finally:
-                db.close()
-            await asyncio.sleep(interval * 60)
-
-    asyncio.create_task(loop())
+            if await is_leader():
+                await sync_once()
+                await sleep_flushing_debounced(interval * 60)
+            else:
+                await asyncio.sleep(interval * 60)
+
+    # Followers poll for leadership on the sync interval; only the leader
+    # keeps a watcher running.
+    async def watch_loop():
+        watcher = None
+        while True:
+            if not await is_leader():
+                if watcher is not None:
+                    await asyncio.to_thread(watcher.stop)
+                    watcher = app.state.filesystem_watcher = None
+                await asyncio.sleep(interval * 60)
+                continue
+            if watcher is None:
+                watcher = FilesystemWatcher(
+                    Path(settings.fs_sync_root).resolve(),
+                    backend=settings.fs_sync_watch_backend,
+                    poll_seconds=settings.fs_sync_watch_polling_interval_seconds,
+                )
+                # Starting walks the tree (initial snapshot or recursive
+                # watches), so keep it off the event loop.
+                if not await asyncio.to_thread(watcher.start):
+                    logger.info("filesystem_watch_fallback", extra={"extra": {"mode": "interval"}})
+                    await loop()
+                    return
+                app.state.filesystem_watcher = watcher
+                await sync_once()
+            await asyncio.sleep(settings.fs_sync_watch_poll_seconds)
+            dirty = watcher.drain()
+            if dirty or change_debouncer.next_due_in() == 0:
+                job = await sync_once(dirty)
+                # A run that lost the scan lock to another worker (or failed)
+                # never looked at these paths; keep them for the next tick.
+                if dirty and (job.status == "failed" or (job.result or {}).get("status") == "skipped"):
+                    watcher.requeue(dirty)
+
+    asyncio.create_task(watch_loop() if settings.fs_sync_mode == "watch" else loop())
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    watcher = getattr(app.state, "filesystem_watcher", None)
+    if watcher is not None:
+        watcher.stop()
+    leader = getattr(app.state, "filesystem_sync_leader", None)
+    if leader is not None:
+        leader.resign()
+    job_runner.shutdown()
 
 
 @app.get("/")
@@ -135,13 +207,28 @@ def root():
     return {"status": "ok"}
 
 
+@app.on_event("startup")
+@startup_profile.hook
+async def start_metrics_refresher():
+    interval = max(settings.metrics_refresh_seconds, 1.0)
+
+    async def loop():
+        while True:
+            await asyncio.to_thread(refresh_db_gauges, SessionLocal)
+            await asyncio.sleep(interval)
+
+    asyncio.create_task(loop())
+
+
 @app.get("/metrics")
 def metrics():
-    db: Session = SessionLocal()
-    try:
-        payload = render_metrics(db)
-    except Exception:
-        payload = render_metrics(None)
-    finally:
-        db.close()
-    return Response(content=payload, media_type=METRICS_CONTENT_TYPE)
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+startup_profile.record("import", __name__, time.perf_counter() - startup_profile.started)
+
+
+# Registered last, so it runs after every other startup hook.
+@app.on_event("startup")
+def report_startup_profile():
+    logger.info("startup_profile", extra={"extra": {"phase": "boot", **startup_profile.report(["import", "startup"])}})
@@ -1,12 +1,36 @@
 from __future__ import annotations
 
-from typing import Optional
+import os
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
 
-from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from .config import settings
+from .logging.json_logger import dropped_records
 from .models import Task, Project, Brand, ContentItem
 
+UNMATCHED_PATH_LABEL = "__unmatched__"
+OVERFLOW_PATH_LABEL = "__overflow__"
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+# prometheus_client switches to per-process mmap value files when this is
+# set before import; scrapes then aggregate every worker's files.
+MULTIPROCESS_MODE = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
 HTTP_REQUESTS_TOTAL = Counter(
     "http_requests_total",
     "Total HTTP requests",
@@ -18,6 +42,33 @@ HTTP_REQUEST_DURATION = Histogram(
     ["method", "path"],
 )
 
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["method", "path"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL per HTTP request",
+    ["method", "path"],
+)
+
+HTTP_PATH_LABEL_OVERFLOW_TOTAL = Counter(
+    "http_path_label_overflow_total",
+    "Requests recorded under the overflow path label because the path label cap was reached",
+)
+
+RATE_LIMIT_REQUESTS_TOTAL = Counter(
+    "rate_limit_requests_total",
+    "Requests checked against a rate limit, by limit and outcome",
+    ["limit", "outcome"],
+)
+RATE_LIMIT_EVICTIONS_TOTAL = Counter(
+    "rate_limit_evictions_total",
+    "In-process rate limit buckets evicted to stay under the key cap",
+)
+
 AI_RUNS_TOTAL = Counter(
     "ai_runs_total",
     "AI runs by agent and status",
@@ -44,30 +95,139 @@ TASKS_OPEN_BY_BRAND = Gauge(
     "tasks_open_by_brand",
     "Open tasks by brand and status",
     ["brand", "status"],
+    multiprocess_mode="livemostrecent",
 )
 PROJECTS_BY_BRAND_AND_STAGE = Gauge(
     "projects_by_brand_and_stage",
     "Projects by brand and stage",
     ["brand", "stage"],
+    multiprocess_mode="livemostrecent",
 )
 CONTENT_ITEMS_BY_BRAND_AND_STATUS = Gauge(
     "content_items_by_brand_and_status",
     "Content items by brand and status",
     ["brand", "status"],
+    multiprocess_mode="livemostrecent",
 )
 
+FS_SYNC_DEBOUNCE_CHANGES_TOTAL = Counter(
+    "filesystem_sync_debounce_changes_total",
+    "Raw project changes entering the filesystem sync debounce stage",
+)
+FS_SYNC_DEBOUNCE_MERGED_TOTAL = Counter(
+    "filesystem_sync_debounce_merged_total",
+    "Raw project changes merged into a consolidated change or cancelled out",
+)
+FS_SYNC_DEBOUNCE_EMITTED_TOTAL = Counter(
+    "filesystem_sync_debounce_emitted_total",
+    "Consolidated project changes emitted by the debounce stage",
+    ["change_type"],
+)
+FS_SYNC_DEBOUNCE_PENDING = Gauge(
+    "filesystem_sync_debounce_pending",
+    "Projects held by the debounce stage until they are quiet",
+    multiprocess_mode="livesum",
+)
+
+DB_GAUGES_REFRESH_DURATION = Histogram(
+    "db_gauges_refresh_duration_seconds",
+    "Time spent recomputing database-backed gauges",
+)
+DB_GAUGES_REFRESH_FAILURES_TOTAL = Counter(
+    "db_gauges_refresh_failures_total",
+    "Failed database gauge refreshes",
+)
+DB_GAUGES_LAST_REFRESH = Gauge(
+    "db_gauges_last_refresh_timestamp_seconds",
+    "Unix time of the last successful database gauge refresh",
+    multiprocess_mode="livemax",
+)
+_last_gauge_refresh: Optional[float] = None
+
+
+# Computed at scrape time, so it cannot live in an mmap value file. Every
+# worker runs the refresher, so the scraped worker's own staleness is an
+# upper bound for the aggregated gauges.
+class _DbGaugesStalenessCollector:
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        staleness = float("nan") if _last_gauge_refresh is None else time.time() - _last_gauge_refresh
+        yield GaugeMetricFamily(
+            "db_gauges_staleness_seconds",
+            "Seconds since the last successful database gauge refresh",
+            value=staleness,
+        )
+
+
+DB_GAUGES_STALENESS = _DbGaugesStalenessCollector()
+
+
+# Drops in the scraped process's queue log handler (LOG_MODE=queue); always
+# 0 in sync mode.
+class _LogDropsCollector:
+    def collect(self) -> Iterator[CounterMetricFamily]:
+        yield CounterMetricFamily(
+            "log_records_dropped",
+            "Log records dropped because the log queue was full",
+            value=dropped_records(),
+        )
+
+
+LOG_RECORDS_DROPPED = _LogDropsCollector()
+if not MULTIPROCESS_MODE:
+    REGISTRY.register(DB_GAUGES_STALENESS)
+    REGISTRY.register(LOG_RECORDS_DROPPED)
+
 SYSTEM_HEALTH_STATUS = Gauge(
     "system_health_status",
     "System health status (0=green,1=yellow,2=red)",
     ["scope"],
+    multiprocess_mode="mostrecent",
 )
 
 
+_path_labels: set[str] = set()
+_path_labels_lock = threading.Lock()
+
+
+# Labels requests by the matched route template ("/system/jobs/{job_id}"),
+# never the raw URL. Unmatched requests share one label and new templates
+# beyond settings.metrics_path_label_limit are folded into an overflow label.
+def route_path_label(scope: dict[str, Any]) -> str:
+    route = scope.get("route")
+    label = getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_PATH_LABEL
+    if label in _path_labels:
+        return label
+    with _path_labels_lock:
+        if label not in _path_labels:
+            if len(_path_labels) >= settings.metrics_path_label_limit:
+                HTTP_PATH_LABEL_OVERFLOW_TOTAL.inc()
+                return OVERFLOW_PATH_LABEL
+            _path_labels.add(label)
+    return label
+
+
+def method_label(method: str) -> str:
+    return method if method in KNOWN_METHODS else "OTHER"
+
+
 def record_request(method: str, path: str, status_code: int, duration_seconds: float) -> None:
     HTTP_REQUESTS_TOTAL.labels(method=method, path=path, status_code=str(status_code)).inc()
     HTTP_REQUEST_DURATION.labels(method=method, path=path).observe(duration_seconds)
 
 
+def record_request_db(method: str, path: str, queries: int, duration_seconds: float) -> None:
+    HTTP_REQUEST_DB_QUERIES.labels(method=method, path=path).observe(queries)
+    HTTP_REQUEST_DB_DURATION.labels(method=method, path=path).observe(duration_seconds)
+
+
+def record_rate_limit(limit: str, allowed: bool) -> None:
+    RATE_LIMIT_REQUESTS_TOTAL.labels(limit=limit, outcome="allowed" if allowed else "limited").inc()
+
+
+def record_rate_limit_evictions(count: int) -> None:
+    RATE_LIMIT_EVICTIONS_TOTAL.inc(count)
+
+
 def record_ai_run(agent: str, status: str, duration_seconds: Optional[float]) -> None:
     AI_RUNS_TOTAL.labels(agent=agent, status=status).inc()
     if duration_seconds is not None:
@@ -80,51 +240,80 @@ def record_workflow_event(workflow_name: str, source: str, success: bool) -> Non
         WORKFLOWS_FAILED_TOTAL.labels(workflow_name=workflow_name).inc()
 
 
+def record_debounce(changes: int, merged: int, emitted: list[str], pending: int) -> None:
+    FS_SYNC_DEBOUNCE_CHANGES_TOTAL.inc(changes)
+    FS_SYNC_DEBOUNCE_MERGED_TOTAL.inc(merged)
+    for change_type in emitted:
+        FS_SYNC_DEBOUNCE_EMITTED_TOTAL.labels(change_type=change_type).inc()
+    FS_SYNC_DEBOUNCE_PENDING.set(pending)
+
+
+# One GROUP BY per table so the database does the counting; scrape cost
+# depends on the number of (brand, status) pairs, not on row counts.
 def update_db_gauges(db: Session) -> None:
-    brands = db.query(Brand).all()
-    for brand in brands:
-        tasks = (
-            db.query(Task.status)
-            .filter(Task.brand_id == brand.id)
-            .all()
-        )
-        counts: dict[str, int] = {}
-        for (status,) in tasks:
-            counts[status] = counts.get(status, 0) + 1
-        total = sum(counts.values())
-        TASKS_OPEN_BY_BRAND.labels(brand=brand.slug, status="all").set(total)
-        for status, count in counts.items():
-            TASKS_OPEN_BY_BRAND.labels(brand=brand.slug, status=status).set(count)
-
-        projects = (
-            db.query(Project.stage)
-            .filter(Project.brand_id == brand.id)
-            .all()
-        )
-        project_counts: dict[str, int] = {}
-        for (stage,) in projects:
-            label = stage or "unknown"
-            project_counts[label] = project_counts.get(label, 0) + 1
-        for stage, count in project_counts.items():
-            PROJECTS_BY_BRAND_AND_STAGE.labels(brand=brand.slug, stage=stage).set(count)
+    slugs = dict(db.query(Brand.id, Brand.slug).all())
+
+    task_totals = {brand_id: 0 for brand_id in slugs}
+    task_rows = (
+        db.query(Task.brand_id, Task.status, func.count(Task.id))
+        .group_by(Task.brand_id, Task.status)
+        .all()
+    )
+    for brand_id, status, count in task_rows:
+        task_totals[brand_id] += count
+        TASKS_OPEN_BY_BRAND.labels(brand=slugs[brand_id], status=status).set(count)
+    for brand_id, total in task_totals.items():
+        TASKS_OPEN_BY_BRAND.labels(brand=slugs[brand_id], status="all").set(total)
+
+    project_counts: dict[tuple[int, str], int] = {}
+    project_rows = (
+        db.query(Project.brand_id, Project.stage, func.count(Project.id))
+        .group_by(Project.brand_id, Project.stage)
+        .all()
+    )
+    for brand_id, stage, count in project_rows:
+        key = (brand_id, stage or "unknown")
+        project_counts[key] = project_counts.get(key, 0) + count
+    for (brand_id, stage), count in project_counts.items():
+        PROJECTS_BY_BRAND_AND_STAGE.labels(brand=slugs[brand_id], stage=stage).set(count)
 
     content_rows = (
-        db.query(Brand.slug, ContentItem.status)
-        .join(ContentItem, ContentItem.brand_id == Brand.id)
+        db.query(ContentItem.brand_id, ContentItem.status, func.count(ContentItem.id))
+        .group_by(ContentItem.brand_id, ContentItem.status)
         .all()
     )
-    content_counts: dict[tuple[str, str], int] = {}
-    for brand_slug, status in content_rows:
-        key = (brand_slug, status)
-        content_counts[key] = content_counts.get(key, 0) + 1
-    for (brand_slug, status), count in content_counts.items():
-        CONTENT_ITEMS_BY_BRAND_AND_STATUS.labels(brand=brand_slug, status=status).set(count)
+    for brand_id, status, count in content_rows:
+        CONTENT_ITEMS_BY_BRAND_AND_STATUS.labels(brand=slugs[brand_id], status=status).set(count)
+
+
+# Called by the background refresher; /metrics only serialises the registry.
+def refresh_db_gauges(session_factory: Callable[[], Session]) -> bool:
+    global _last_gauge_refresh
+    start = time.perf_counter()
+    db = session_factory()
+    try:
+        update_db_gauges(db)
+    except Exception:
+        DB_GAUGES_REFRESH_FAILURES_TOTAL.inc()
+        return False
+    finally:
+        db.close()
+    DB_GAUGES_REFRESH_DURATION.observe(time.perf_counter() - start)
+    _last_gauge_refresh = time.time()
+    DB_GAUGES_LAST_REFRESH.set(_last_gauge_refresh)
+    return True
 
 
 def render_metrics(db: Optional[Session] = None) -> bytes:
     if db is not None:
         update_db_gauges(db)
-    return generate_latest()
+    if not MULTIPROCESS_MODE:
+        return generate_latest()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(DB_GAUGES_STALENESS)
+    registry.register(LOG_RECORDS_DROPPED)
+    return generate_latest(registry)
 
 
 METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,88 @@
+import time
+import uuid
+
+from starlette import status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .db_stats import stop_tracking, track_request
+from .logging.json_logger import get_logger
+from .metrics import method_label, record_request, record_request_db, route_path_label
+from .services.rate_limiter import RateLimiter, retry_after_header
+
+logger = get_logger("api")
+
+
+# Rate limiting, correlation ids, timing, the request log line and request
+# metrics as one plain ASGI middleware: no BaseHTTPMiddleware task or
+# response stream per request. Duration is taken when the response starts,
+# as call_next did; the log line and metrics are written once the app
+# returns, so they include DB work done while streaming the body.
+class RequestMiddleware:
+    def __init__(self, app: ASGIApp, rate_limiter: RateLimiter):
+        self.app = app
+        self.rate_limiter = rate_limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        client = scope.get("client")
+        retry_after = self.rate_limiter.check(path, client[0] if client else "unknown")
+        if retry_after is not None:
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Rate limit exceeded"},
+                headers={"retry-after": retry_after_header(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        correlation_id = Headers(scope=scope).get("x-correlation-id")
+        if correlation_id is None:
+            correlation_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+        db_stats, db_stats_token = track_request(correlation_id)
+        start_time = time.perf_counter()
+        status_code = 500
+        duration = 0.0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, duration
+            if message["type"] == "http.response.start":
+                duration = time.perf_counter() - start_time
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["x-correlation-id"] = correlation_id
+                if settings.server_timing_header:
+                    headers["server-timing"] = (
+                        f'db;dur={db_stats.duration_ms};desc="{db_stats.queries} queries", '
+                        f"app;dur={round(duration * 1000, 3)}"
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_tracking(db_stats_token)
+
+        logger.info(
+            "request",
+            extra={
+                "extra": {
+                    "correlation_id": correlation_id,
+                    "method": scope["method"],
+                    "path": path,
+                    "status_code": status_code,
+                    "db_queries": db_stats.queries,
+                    "db_time_ms": db_stats.duration_ms,
+                }
+            },
+        )
+        method, path_label = method_label(scope["method"]), route_path_label(scope)
+        record_request(method, path_label, status_code, duration)
+        record_request_db(method, path_label, db_stats.queries, db_stats.duration_seconds)
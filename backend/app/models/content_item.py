@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Index, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 
 class ContentItem(BaseModel):
     __tablename__ = "content_items"
+    __table_args__ = (
+        Index(
+            "uq_content_items_filesystem_sync_title",
+            "title",
+            unique=True,
+            postgresql_where=text("source = 'filesystem_sync'"),
+            sqlite_where=text("source = 'filesystem_sync'"),
+        ),
+    )
     id = Column(Integer, primary_key=True)
     brand_id = Column(Integer, ForeignKey("brands.id"), nullable=False)
     title = Column(String, nullable=False)
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 
 class Project(BaseModel):
     __tablename__ = "projects"
+    __table_args__ = (Index("uq_projects_filesystem_path", "filesystem_path", unique=True),)
     id = Column(Integer, primary_key=True)
     brand_id = Column(Integer, ForeignKey("brands.id"), nullable=False)
     name = Column(String, nullable=False)
@@ -12,6 +13,7 @@ class Project(BaseModel):
     stage = Column(String, nullable=True)
     status = Column(String, nullable=False)
     priority = Column(String, nullable=False)
+    filesystem_path = Column(String)
     meta = Column(JSON, default=dict)
 
     brand = relationship("Brand")
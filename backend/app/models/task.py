@@ -1,10 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Index, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 
 class Task(BaseModel):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index(
+            "uq_tasks_filesystem_sync_project_title",
+            "project_id",
+            "title",
+            unique=True,
+            postgresql_where=text("source = 'filesystem_sync'"),
+            sqlite_where=text("source = 'filesystem_sync'"),
+        ),
+    )
     id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
     brand_id = Column(Integer, ForeignKey("brands.id"), nullable=False)
@@ -0,0 +1,108 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from ..config import settings
+from ..metrics import record_debounce
+
+Change = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class _PendingChange:
+    change_type: str
+    descriptor: Dict[str, Any]
+    first_seen: float
+    last_seen: float
+    events: int = 1
+    changed_paths: List[str] = field(default_factory=list)
+
+
+# Holds detected project changes until the project has been quiet for the
+# window, then emits one consolidated change. Held projects keep their old
+# snapshot record, so each detection is already the net change against the
+# last emitted state; the debouncer only tracks timing, the latest
+# descriptor and how many raw changes were folded together. A project that
+# never goes quiet is still emitted once it has been held for max_hold.
+class ChangeDebouncer:
+    def __init__(
+        self,
+        window_seconds: float,
+        max_hold_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self.max_hold_seconds = max_hold_seconds if max_hold_seconds is not None else window_seconds * 10
+        self._clock = clock
+        self._pending: Dict[str, _PendingChange] = {}
+        self._lock = threading.Lock()
+
+    def settle(
+        self, changes: List[Change], observed: Set[str] | None, force: bool = False
+    ) -> Tuple[List[Change], int]:
+        now = self._clock()
+        merged = 0
+        with self._lock:
+            changed = set()
+            for change_type, descriptor in changes:
+                path = descriptor["path"]
+                changed.add(path)
+                paths = descriptor.get("changed_paths", [])
+                entry = self._pending.get(path)
+                if entry is None:
+                    self._pending[path] = _PendingChange(change_type, descriptor, now, now, changed_paths=list(paths))
+                    continue
+                same_fingerprint = descriptor.get("fingerprint") == entry.descriptor.get("fingerprint")
+                if change_type == entry.change_type and same_fingerprint:
+                    continue
+                merged += 1
+                entry.events += 1
+                entry.change_type = change_type
+                entry.descriptor = descriptor
+                entry.last_seen = now
+                entry.changed_paths.extend(p for p in paths if p not in entry.changed_paths)
+
+            # Observed again with no net change: reverted, or created and
+            # removed inside the window.
+            for path in list(self._pending):
+                if path not in changed and (observed is None or path in observed):
+                    merged += self._pending.pop(path).events
+
+            emitted: List[Change] = []
+            for path, entry in list(self._pending.items()):
+                settled = now - entry.last_seen >= self.window_seconds
+                if not (force or settled or now - entry.first_seen >= self.max_hold_seconds):
+                    continue
+                del self._pending[path]
+                if entry.change_type != "deleted_project" and not Path(path).is_dir():
+                    merged += entry.events
+                    continue
+                descriptor = {**entry.descriptor, "changed_paths": entry.changed_paths, "merged_events": entry.events}
+                emitted.append((entry.change_type, descriptor))
+            pending = len(self._pending)
+        record_debounce(len(changes), merged, [change_type for change_type, _ in emitted], pending)
+        return emitted, merged
+
+    def held_paths(self) -> Set[str]:
+        with self._lock:
+            return set(self._pending)
+
+    def tree(self, path: str) -> Dict[str, Any] | None:
+        with self._lock:
+            entry = self._pending.get(path)
+            return entry.descriptor.get("tree") if entry else None
+
+    def next_due_in(self) -> float | None:
+        with self._lock:
+            if not self._pending:
+                return None
+            due_at = min(
+                min(entry.last_seen + self.window_seconds, entry.first_seen + self.max_hold_seconds)
+                for entry in self._pending.values()
+            )
+        return max(due_at - self._clock(), 0.0)
+
+
+change_debouncer = ChangeDebouncer(settings.fs_sync_debounce_seconds)
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import threading
+from typing import Dict, List, Set, Tuple
+
+SAMPLE_BLOCK_BYTES = 64 * 1024
+READ_CHUNK_BYTES = 1024 * 1024
+
+HashKey = Tuple[int, int, int]
+
+
+def file_digest(path: str, size: int, full_hash_bytes: int) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        # Sampling reads three blocks anyway, so anything up to that size is
+        # hashed in full (and never seeks to a negative offset).
+        if size <= max(full_hash_bytes, 3 * SAMPLE_BLOCK_BYTES):
+            for block in iter(lambda: handle.read(READ_CHUNK_BYTES), b""):
+                hasher.update(block)
+        else:
+            # Head, middle and tail blocks plus the size: catches re-renders
+            # and truncation without reading multi-GB stems end to end.
+            hasher.update(str(size).encode("utf-8"))
+            for offset in (0, (size - SAMPLE_BLOCK_BYTES) // 2, size - SAMPLE_BLOCK_BYTES):
+                handle.seek(offset)
+                hasher.update(handle.read(SAMPLE_BLOCK_BYTES))
+    return hasher.hexdigest()
+
+
+# Content digests for one sync run, backed by the snapshot store's hash
+# cache keyed by (inode, size, mtime_ns) so unchanged files are never
+# re-read. New digests are buffered and written once at the end of the run.
+class ContentHasher:
+    def __init__(self, store=None, full_hash_bytes: int = 1024 * 1024):
+        self._store = store
+        self.full_hash_bytes = full_hash_bytes
+        self._new: Dict[HashKey, str] = {}
+        self._seen: Set[HashKey] = set()
+        self._lock = threading.Lock()
+        self.files_hashed = 0
+
+    def digests(self, directory: str, files: List[Tuple[str, os.stat_result]]) -> Dict[str, str]:
+        keys = {name: (stat.st_ino, stat.st_size, stat.st_mtime_ns) for name, stat in files}
+        cached = self._store.file_hashes(list(keys.values())) if self._store is not None and keys else {}
+        result: Dict[str, str] = {}
+        for name, key in keys.items():
+            digest = cached.get(key)
+            if digest is None:
+                with self._lock:
+                    digest = self._new.get(key)
+            if digest is None:
+                try:
+                    digest = file_digest(os.path.join(directory, name), key[1], self.full_hash_bytes)
+                except OSError:
+                    continue
+                with self._lock:
+                    self._new[key] = digest
+                    self.files_hashed += 1
+            result[name] = digest
+        with self._lock:
+            self._seen.update(keys.values())
+        return result
+
+    def flush(self, prune: bool = False) -> None:
+        if self._store is None:
+            return
+        with self._lock:
+            rows = [(*key, digest) for key, digest in self._new.items()]
+            self._new = {}
+        self._store.put_file_hashes(rows)
+        if prune:
+            self._store.prune_file_hashes(self._seen)
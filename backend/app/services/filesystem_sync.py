@@ -1,54 +1,40 @@
 import hashlib
-import json
 import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
 
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 
 from ..config import settings
-from ..models import Project, Task, ContentItem
-from ..services.audit_service import write_audit_log
+from ..database import SessionLocal, engine
+from ..logging.json_logger import get_logger
+from ..models import AIRun, AuditLog, Project, Task, ContentItem
 from ..services.ai_run_service import start_ai_run, complete_ai_run
+from ..services.audit_service import write_audit_log
 from ..services.brand_service import get_brand_by_slug
-from ..ai.filesystem_sync_agent import interpret_change, ProjectSummary
-
-
-SNAPSHOT_PATH = Path("/app/logs/filesystem_snapshot.json")
+from ..services.change_debounce import change_debouncer
+from ..services.content_hash import ContentHasher
+from ..services.memory_journal import MemoryJournal
+from ..services.scan_ignore import IgnoreRules, ignore_rules
+from ..services.snapshot_store import SnapshotStore
+from ..services.sync_coordination import scan_lock
+from ..ai.filesystem_sync_agent import features_from_files, interpret_change, ProjectSummary
+
+logger = get_logger("filesystem_sync")
+
+SNAPSHOT_PATH = Path("/app/logs/filesystem_snapshot.db")
+LEGACY_SNAPSHOT_PATH = Path("/app/logs/filesystem_snapshot.json")
 ALLOWED_ROOT = Path(settings.fs_sync_root).resolve()
 REPO_ROOT = Path(__file__).resolve().parents[2]
 PROJECTS_OVERVIEW = REPO_ROOT / "ai" / "memory" / "systems" / "projects_overview.md"
-
-
-def _ensure_snapshot_dir():
-    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-
-def _load_snapshot() -> Dict[str, Any]:
-    if not SNAPSHOT_PATH.exists():
-        return {}
-    try:
-        return json.loads(SNAPSHOT_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
-
-
-def _save_snapshot(snapshot: Dict[str, Any]) -> None:
-    _ensure_snapshot_dir()
-    SNAPSHOT_PATH.write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
-
-
-def _append_project_overview(entry: str) -> bool:
-    try:
-        PROJECTS_OVERVIEW.parent.mkdir(parents=True, exist_ok=True)
-        if not PROJECTS_OVERVIEW.exists():
-            PROJECTS_OVERVIEW.write_text("# Projects Overview\n\n", encoding="utf-8")
-        with PROJECTS_OVERVIEW.open("a", encoding="utf-8") as handle:
-            handle.write(entry + "\n")
-        return True
-    except Exception:
-        return False
+PROJECTS_OVERVIEW_HEADER = "# Projects Overview\n\n"
+CHANGED_PATHS_AUDIT_LIMIT = 50
+MEMORY_AUDIT_ENTRY_LIMIT = 50
+TREE_VERSION = 2
 
 
 def _fingerprint(files: List[Dict[str, Any]]) -> str:
@@ -56,170 +42,585 @@ def _fingerprint(files: List[Dict[str, Any]]) -> str:
     for entry in sorted(files, key=lambda x: x["path"]):
         hasher.update(entry["path"].encode("utf-8"))
         hasher.update(str(entry.get("size", 0)).encode("utf-8"))
-        hasher.update(str(entry.get("mtime", 0)).encode("utf-8"))
+        if "hash" in entry:
+            hasher.update(entry["hash"].encode("utf-8"))
+        else:
+            hasher.update(str(entry.get("mtime", 0)).encode("utf-8"))
     return hasher.hexdigest()
 
 
-def _scan_project_dir(project_path: Path, brand: str) -> Dict[str, Any]:
-    files: List[Dict[str, Any]] = []
-    total_size = 0
-    last_modified = 0.0
-
-    for root, _, filenames in os.walk(project_path):
-        for filename in filenames:
-            full_path = Path(root) / filename
+def _dir_is_clean(rel_dir: str, dirty_dirs: Set[str] | None) -> bool:
+    if dirty_dirs is None:
+        return settings.fs_sync_prune_unchanged_dirs
+    return rel_dir not in dirty_dirs
+
+
+def _has_dirty_below(rel_dir: str, dirty_dirs: Set[str]) -> bool:
+    if not rel_dir:
+        return bool(dirty_dirs)
+    prefix = rel_dir + os.sep
+    return any(path == rel_dir or path.startswith(prefix) for path in dirty_dirs)
+
+
+def _scan_tree(
+    path: str,
+    rel_dir: str,
+    mtime_ns: int,
+    previous: Dict[str, Any] | None,
+    dirty_dirs: Set[str] | None,
+    rules: IgnoreRules,
+    content_hasher: ContentHasher | None = None,
+) -> Dict[str, Any]:
+    clean = (
+        previous is not None
+        and previous.get("mtime_ns") == mtime_ns
+        and _dir_is_clean(rel_dir, dirty_dirs)
+    )
+    if clean and dirty_dirs is not None and not _has_dirty_below(rel_dir, dirty_dirs):
+        return previous
+
+    children: Dict[str, Dict[str, Any]] = {}
+    previous_children = previous.get("dirs", {}) if previous else {}
+    if clean:
+        own_features = previous["own_features"]
+        own = previous["own"]
+        size = previous["size"]
+        last_modified = previous["last_modified"]
+        pruned = previous.get("pruned", 0)
+        for name, child in previous_children.items():
+            child_path = os.path.join(path, name)
             try:
-                stat = full_path.stat()
-            except FileNotFoundError:
+                child_mtime_ns = os.stat(child_path).st_mtime_ns
+            except OSError:
                 continue
-            rel_path = str(full_path.relative_to(project_path))
-            files.append({"path": rel_path, "size": stat.st_size, "mtime": int(stat.st_mtime)})
-            total_size += stat.st_size
-            last_modified = max(last_modified, stat.st_mtime)
+            children[name] = _scan_tree(
+                child_path,
+                os.path.join(rel_dir, name),
+                child_mtime_ns,
+                child,
+                dirty_dirs,
+                rules,
+                content_hasher,
+            )
+    else:
+        entries_meta: List[Dict[str, Any]] = []
+        stats: List[Tuple[str, os.stat_result]] = []
+        size = 0
+        last_modified = 0.0
+        pruned = 0
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            entries = None
+        if entries is not None:
+            with entries:
+                for entry in entries:
+                    rel_path = os.path.join(rel_dir, entry.name)
+                    try:
+                        if entry.is_dir():
+                            if rules.ignored(rel_path, is_dir=True):
+                                pruned += 1
+                            elif not entry.is_symlink():
+                                children[entry.name] = _scan_tree(
+                                    entry.path,
+                                    rel_path,
+                                    entry.stat().st_mtime_ns,
+                                    previous_children.get(entry.name),
+                                    dirty_dirs,
+                                    rules,
+                                    content_hasher,
+                                )
+                            continue
+                        if rules.ignored(rel_path, is_dir=False):
+                            continue
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries_meta.append({"path": entry.name, "size": stat.st_size, "mtime": int(stat.st_mtime)})
+                    stats.append((entry.name, stat))
+                    size += stat.st_size
+                    last_modified = max(last_modified, stat.st_mtime)
+        if content_hasher is not None:
+            digests = content_hasher.digests(path, stats)
+            for meta in entries_meta:
+                if meta["path"] in digests:
+                    meta["hash"] = digests[meta["path"]]
+        own_features = features_from_files([meta["path"] for meta in entries_meta])
+        own = _fingerprint(entries_meta)
+
+    hasher = hashlib.sha256(own.encode("utf-8"))
+    for name in sorted(children):
+        hasher.update(name.encode("utf-8"))
+        hasher.update(children[name]["hash"].encode("utf-8"))
+    return {
+        "mtime_ns": mtime_ns,
+        "own": own,
+        "hash": hasher.hexdigest(),
+        "own_features": own_features,
+        "features": _subtree_features(own_features, children),
+        "size": size,
+        "last_modified": last_modified,
+        "pruned": pruned,
+        "dirs": children,
+    }
+
+
+# Folds child subtrees into a directory's own features. Directory names
+# count towards the name flags once the directory holds any file, matching
+# a substring check over the full relative paths.
+def _subtree_features(own_features: Dict[str, Any], children: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    ext = dict(own_features["ext"])
+    features = {
+        "file_count": own_features["file_count"],
+        "ext": ext,
+        "has_tests": own_features["has_tests"],
+        "has_master": own_features["has_master"],
+        "has_mix": own_features["has_mix"],
+    }
+    for name, child in children.items():
+        child_features = child["features"]
+        features["file_count"] += child_features["file_count"]
+        for suffix, count in child_features["ext"].items():
+            ext[suffix] = ext.get(suffix, 0) + count
+        named = child_features["file_count"] > 0
+        lowered = name.lower()
+        features["has_tests"] |= child_features["has_tests"] or (named and "tests" in name)
+        features["has_master"] |= child_features["has_master"] or (named and "master" in lowered)
+        features["has_mix"] |= child_features["has_mix"] or (named and "mix" in lowered)
+    return features
+
+
+def _tree_totals(node: Dict[str, Any]) -> Tuple[int, float, int]:
+    total_size = node["size"]
+    last_modified = node["last_modified"]
+    pruned = node.get("pruned", 0)
+    for child in node["dirs"].values():
+        child_size, child_modified, child_pruned = _tree_totals(child)
+        total_size += child_size
+        last_modified = max(last_modified, child_modified)
+        pruned += child_pruned
+    return total_size, last_modified, pruned
+
+
+def _changed_dirs(
+    previous: Dict[str, Any] | None, current: Dict[str, Any], rel_dir: str, changed: List[str]
+) -> None:
+    if previous is None:
+        changed.append(rel_dir or ".")
+        return
+    if previous["hash"] == current["hash"]:
+        return
+    if previous["own"] != current["own"]:
+        changed.append(rel_dir or ".")
+    previous_children = previous.get("dirs", {})
+    for name, child in current["dirs"].items():
+        _changed_dirs(previous_children.get(name), child, os.path.join(rel_dir, name), changed)
+    for name in previous_children:
+        if name not in current["dirs"]:
+            changed.append(os.path.join(rel_dir, name))
+
+
+def _scan_project_dir(
+    project_path: Path,
+    brand: str,
+    previous_tree: Dict[str, Any] | None = None,
+    dirty_dirs: Set[str] | None = None,
+    content_hasher: ContentHasher | None = None,
+) -> Dict[str, Any]:
+    try:
+        mtime_ns = project_path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    rules = ignore_rules(brand)
+    fingerprint_mode = "content" if content_hasher is not None else "metadata"
+    # Cached subtrees were pruned and fingerprinted under the settings they
+    # were scanned with.
+    cached_tree = previous_tree
+    if previous_tree and (
+        previous_tree.get("ignore") != rules.digest
+        or previous_tree.get("version") != TREE_VERSION
+        or previous_tree.get("fingerprint_mode", "metadata") != fingerprint_mode
+    ):
+        cached_tree = None
+    tree = _scan_tree(str(project_path), "", mtime_ns, cached_tree, dirty_dirs, rules, content_hasher)
+    tree["ignore"] = rules.digest
+    tree["version"] = TREE_VERSION
+    tree["fingerprint_mode"] = fingerprint_mode
+    total_size, last_modified, pruned_dirs = _tree_totals(tree)
+    features = {**tree["features"], "markers": tree["own_features"]["markers"]}
+    changed_paths: List[str] = []
+    if previous_tree is not None:
+        _changed_dirs(previous_tree, tree, "", changed_paths)
 
     descriptor = {
         "path": str(project_path),
         "brand": brand,
         "name": project_path.name,
-        "files": [f["path"] for f in files],
-        "file_count": len(files),
+        "features": features,
+        "file_count": features["file_count"],
         "total_size": total_size,
         "last_modified": int(last_modified),
-        "fingerprint": _fingerprint(files),
+        "pruned_dirs": pruned_dirs,
+        "fingerprint": tree["hash"],
+        "tree": tree,
+        "tree_changed": tree != previous_tree,
+        "changed_paths": changed_paths,
     }
     return descriptor
 
 
-def _scan_root(root: Path) -> Dict[str, Dict[str, Any]]:
-    if not root.exists():
-        return {}
-    if not str(root.resolve()).startswith(str(ALLOWED_ROOT)):
-        raise ValueError("Filesystem sync root outside allowed directory")
+ScanTarget = Tuple[Path, str, Set[str] | None]
+TreeLoader = Callable[[str], Dict[str, Any] | None]
+
+
+def _no_previous_tree(path: str) -> Dict[str, Any] | None:
+    return None
 
-    projects: Dict[str, Dict[str, Any]] = {}
+
+def _scan_target(
+    target: ScanTarget, load_tree: TreeLoader, content_hasher: ContentHasher | None = None
+) -> Dict[str, Any]:
+    project_path, brand, dirty_dirs = target
+    return _scan_project_dir(project_path, brand, load_tree(str(project_path)), dirty_dirs, content_hasher)
+
+
+def _iter_scan_projects(
+    targets: Iterable[ScanTarget], load_tree: TreeLoader, content_hasher: ContentHasher | None = None
+) -> Iterator[Dict[str, Any]]:
+    workers = max(settings.fs_sync_scan_workers, 1)
+    if workers == 1:
+        for target in targets:
+            yield _scan_target(target, load_tree, content_hasher)
+        return
+    # At most two scans per worker are in flight or waiting to be consumed,
+    # and each future is dropped as its descriptor is yielded, so peak
+    # memory follows the window rather than the number of projects.
+    remaining = iter(targets)
+    window = workers * 2
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fs-scan") as executor:
+        while True:
+            for target in islice(remaining, window - len(pending)):
+                pending.add(executor.submit(_scan_target, target, load_tree, content_hasher))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            while done:
+                yield done.pop().result()
+
+
+def _project_targets(root: Path) -> Iterator[ScanTarget]:
     for brand_folder in ["tech", "records"]:
         brand_path = root / brand_folder
         if not brand_path.exists():
             continue
-        for child in brand_path.iterdir():
-            if child.is_dir():
-                descriptor = _scan_project_dir(child, brand_folder)
-                projects[str(child)] = descriptor
-    return projects
+        with os.scandir(brand_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield Path(entry.path), brand_folder, None
+
 
+def iter_scan_root(
+    root: Path, load_tree: TreeLoader = _no_previous_tree, content_hasher: ContentHasher | None = None
+) -> Iterator[Dict[str, Any]]:
+    if not root.exists():
+        return
+    if not str(root.resolve()).startswith(str(ALLOWED_ROOT)):
+        raise ValueError("Filesystem sync root outside allowed directory")
+    yield from _iter_scan_projects(list(_project_targets(root)), load_tree, content_hasher)
 
-def _detect_changes(current: Dict[str, Dict[str, Any]], snapshot: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+
+def _scan_root(
+    root: Path, load_tree: TreeLoader = _no_previous_tree, content_hasher: ContentHasher | None = None
+) -> Dict[str, Dict[str, Any]]:
+    return {descriptor["path"]: descriptor for descriptor in iter_scan_root(root, load_tree, content_hasher)}
+
+
+def iter_scan_paths(
+    root: Path,
+    paths: Iterable[str] | Dict[str, Set[str]],
+    load_tree: TreeLoader = _no_previous_tree,
+    content_hasher: ContentHasher | None = None,
+) -> Iterator[Dict[str, Any]]:
+    targets: List[ScanTarget] = []
+    for path in paths:
+        project_path = Path(path)
+        if project_path.parent.parent != root or project_path.parent.name not in ("tech", "records"):
+            continue
+        if project_path.is_dir():
+            dirty_dirs = paths.get(path) if isinstance(paths, dict) else None
+            targets.append((project_path, project_path.parent.name, dirty_dirs))
+    yield from _iter_scan_projects(targets, load_tree, content_hasher)
+
+
+def _detect_changes(
+    current: Iterable[Dict[str, Any]], previous: Dict[str, Dict[str, Any]]
+) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Dict[str, Any]], int]:
     changes: List[Tuple[str, Dict[str, Any]]] = []
-    prev = snapshot.get("projects", {})
+    snapshot_writes: List[Dict[str, Any]] = []
+    seen: Set[str] = set()
 
-    for path, descriptor in current.items():
-        if path not in prev:
+    for descriptor in current:
+        path = descriptor["path"]
+        seen.add(path)
+        if path not in previous:
             changes.append(("new_project", descriptor))
-        else:
-            if descriptor.get("fingerprint") != prev[path].get("fingerprint"):
-                changes.append(("updated_project", descriptor))
-
-    for path, descriptor in prev.items():
-        if path not in current:
+            snapshot_writes.append(descriptor)
+        elif descriptor.get("fingerprint") != previous[path].get("fingerprint"):
+            changes.append(("updated_project", descriptor))
+            snapshot_writes.append(descriptor)
+        elif descriptor.get("tree_changed", True):
+            snapshot_writes.append(descriptor)
+
+    for path, descriptor in previous.items():
+        if path not in seen:
             changes.append(("deleted_project", descriptor))
 
-    return changes
+    return changes, snapshot_writes, len(seen)
 
 
-def _find_project_by_path(db: Session, filesystem_path: str) -> Project | None:
-    projects = db.query(Project).all()
-    for project in projects:
-        meta = project.meta or {}
-        if meta.get("filesystem_path") == filesystem_path:
-            return project
-    return None
+UPSERT_CHUNK_SIZE = 500
 
 
-def _ensure_task(db: Session, project_id: int, brand_id: int, task_payload: Dict[str, Any]) -> Task:
-    existing = (
-        db.query(Task)
-        .filter(Task.project_id == project_id)
-        .filter(Task.title == task_payload["title"])
-        .filter(Task.source == "filesystem_sync")
-        .first()
-    )
-    if existing:
-        return existing
-    task = Task(
-        project_id=project_id,
-        brand_id=brand_id,
-        title=task_payload["title"],
-        description=task_payload.get("description"),
-        status="open",
-        priority=task_payload.get("priority", "medium"),
-        source="filesystem_sync",
-        created_by="agent",
-        assigned_to="human",
-        meta=task_payload.get("meta", task_payload.get("metadata", {})),
-    )
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
-
-
-def _ensure_content_item(db: Session, brand_id: int, project: Project, item_payload: Dict[str, Any]) -> ContentItem:
-    existing = (
-        db.query(ContentItem)
-        .filter(ContentItem.title == item_payload["title"])
-        .filter(ContentItem.source == "filesystem_sync")
-        .first()
-    )
-    if existing:
-        return existing
-    item = ContentItem(
-        brand_id=brand_id,
-        title=item_payload["title"],
-        type=item_payload.get("type", "post"),
-        status=item_payload.get("status", "idea"),
-        source="filesystem_sync",
-        meta={"project_id": project.id},
-    )
-    db.add(item)
-    db.commit()
-    db.refresh(item)
-    return item
+def _project_ids_by_path(db: Session) -> Dict[str, int]:
+    rows = db.query(Project.filesystem_path, Project.id).filter(Project.filesystem_path.isnot(None)).all()
+    return {path: project_id for path, project_id in rows}
 
 
-def run_filesystem_sync(db: Session, root_override: str | None = None) -> Dict[str, Any]:
+def _existing_sync_rows(db: Session) -> Tuple[Set[Tuple[int, str]], Set[str]]:
+    task_keys = {
+        (project_id, title)
+        for project_id, title in db.query(Task.project_id, Task.title).filter(Task.source == "filesystem_sync")
+    }
+    item_titles = {
+        title for (title,) in db.query(ContentItem.title).filter(ContentItem.source == "filesystem_sync")
+    }
+    return task_keys, item_titles
+
+
+def _dialect_insert(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    return dialect_insert
+
+
+def _insert_ignoring_conflicts(db: Session, model, rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    db.execute(_dialect_insert(db)(model).on_conflict_do_nothing(), rows)
+
+
+def _upsert_projects(db: Session, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    table = Project.__table__
+    project_ids: Dict[str, int] = {}
+    for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = _dialect_insert(db)(table).values(rows[offset : offset + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.filesystem_path],
+            set_={
+                "type": stmt.excluded.type,
+                "stage": stmt.excluded.stage,
+                "status": stmt.excluded.status,
+                "meta": stmt.excluded.meta,
+                "updated_at": func.now(),
+            },
+        ).returning(table.c.id, table.c.filesystem_path)
+        for project_id, path in db.execute(stmt):
+            project_ids[path] = project_id
+    return project_ids
+
+
+# Collects every project, task, content item and audit row produced by one
+# sync run and writes them in a single transaction. Rows refer to projects
+# by filesystem path; ids are resolved once the project upsert has run.
+class _SyncBatch:
+    def __init__(self, db: Session):
+        self.db = db
+        self.project_ids = _project_ids_by_path(db)
+        self.projects: List[Dict[str, Any]] = []
+        self.tasks: List[Tuple[str, int, Dict[str, Any]]] = []
+        self.content_items: List[Tuple[str, int, Dict[str, Any]]] = []
+        self.audit_entries: List[Tuple[str | None, Dict[str, Any]]] = []
+        self.tasks_created = 0
+        self.content_items_created = 0
+
+    def audit(
+        self,
+        action: str,
+        entity_type: str,
+        details: Dict[str, Any],
+        entity_id: str | None = None,
+        project_path: str | None = None,
+    ) -> None:
+        self.audit_entries.append(
+            (
+                project_path,
+                {
+                    "actor_type": "agent",
+                    "actor_id": "filesystem_sync_agent",
+                    "action": action,
+                    "entity_type": entity_type,
+                    "entity_id": entity_id,
+                    "details": details,
+                },
+            )
+        )
+
+    def commit(self) -> None:
+        db = self.db
+        if self.projects:
+            self.project_ids.update(_upsert_projects(db, self.projects))
+        ids = self.project_ids
+        existing_tasks, existing_items = _existing_sync_rows(db) if self.tasks or self.content_items else (set(), set())
+
+        task_rows: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        for path, brand_id, payload in self.tasks:
+            if (ids[path], payload["title"]) in existing_tasks:
+                continue
+            task_rows.setdefault(
+                (ids[path], payload["title"]),
+                {
+                    "project_id": ids[path],
+                    "brand_id": brand_id,
+                    "title": payload["title"],
+                    "description": payload.get("description"),
+                    "status": "open",
+                    "priority": payload.get("priority", "medium"),
+                    "source": "filesystem_sync",
+                    "created_by": "agent",
+                    "assigned_to": "human",
+                    "meta": payload.get("meta", payload.get("metadata", {})),
+                },
+            )
+        _insert_ignoring_conflicts(db, Task, list(task_rows.values()))
+        self.tasks_created = len(task_rows)
+
+        item_rows: Dict[str, Dict[str, Any]] = {}
+        for path, brand_id, payload in self.content_items:
+            if payload["title"] in existing_items:
+                continue
+            item_rows.setdefault(
+                payload["title"],
+                {
+                    "brand_id": brand_id,
+                    "title": payload["title"],
+                    "type": payload.get("type", "post"),
+                    "status": payload.get("status", "idea"),
+                    "source": "filesystem_sync",
+                    "meta": {"project_id": ids[path]},
+                },
+            )
+        _insert_ignoring_conflicts(db, ContentItem, list(item_rows.values()))
+        self.content_items_created = len(item_rows)
+
+        audit_rows = []
+        for path, row in self.audit_entries:
+            entity_id = ids[path] if path is not None else row["entity_id"]
+            audit_rows.append({**row, "entity_id": str(entity_id)})
+        if audit_rows:
+            db.execute(insert(AuditLog), audit_rows)
+        db.commit()
+
+
+def run_filesystem_sync(
+    db: Session,
+    root_override: str | None = None,
+    dirty_paths: Iterable[str] | Dict[str, Set[str]] | None = None,
+    debounce: bool = False,
+) -> Dict[str, Any]:
     root = Path(root_override or settings.fs_sync_root).resolve()
     if not str(root).startswith(str(ALLOWED_ROOT)):
         raise ValueError("Filesystem sync root outside allowed directory")
 
     run = start_ai_run(db, agent_name="filesystem_sync_agent", input_summary=str(root))
-    snapshot = _load_snapshot()
-    current = _scan_root(root)
-    changes = _detect_changes(current, snapshot)
+    store = SnapshotStore(SNAPSHOT_PATH, LEGACY_SNAPSHOT_PATH)
+    store.open()
+    try:
+        return _sync_changes(db, run, root, store, dirty_paths, debounce)
+    finally:
+        store.close()
+
+
+def _count_pruned(
+    descriptors: Iterable[Dict[str, Any]], pruned_by_brand: Dict[str, int]
+) -> Iterator[Dict[str, Any]]:
+    for descriptor in descriptors:
+        brand = descriptor["brand"]
+        pruned_by_brand[brand] = pruned_by_brand.get(brand, 0) + descriptor.get("pruned_dirs", 0)
+        yield descriptor
+
+
+def _sync_changes(
+    db: Session,
+    run: AIRun,
+    root: Path,
+    store: SnapshotStore,
+    dirty_paths: Iterable[str] | Dict[str, Set[str]] | None,
+    debounce: bool,
+) -> Dict[str, Any]:
+    # Projects held by the debouncer keep their last emitted snapshot record;
+    # rescans continue from the tree they were last scanned with.
+    def load_tree(path: str) -> Dict[str, Any] | None:
+        return change_debouncer.tree(path) or store.tree(path)
+
+    content_hasher = None
+    if settings.fs_sync_fingerprint_mode == "content":
+        content_hasher = ContentHasher(store, settings.fs_sync_content_full_hash_bytes)
+
+    previous = store.index()
+    observed: Set[str] | None = None
+    if dirty_paths is None:
+        current = iter_scan_root(root, load_tree, content_hasher)
+    else:
+        if not isinstance(dirty_paths, dict):
+            dirty_paths = set(dirty_paths)
+        observed = set(dirty_paths)
+        previous = {path: previous[path] for path in dirty_paths if path in previous}
+        current = iter_scan_paths(root, dirty_paths, load_tree, content_hasher)
+    pruned_by_brand: Dict[str, int] = {}
+    detected, snapshot_writes, projects_scanned = _detect_changes(
+        _count_pruned(current, pruned_by_brand), previous
+    )
+    directories_pruned = sum(pruned_by_brand.values())
+
+    changes, changes_merged = change_debouncer.settle(detected, observed, force=not debounce)
+    held = change_debouncer.held_paths()
+    snapshot_writes = [descriptor for descriptor in snapshot_writes if descriptor["path"] not in held]
+    written = {descriptor["path"] for descriptor in snapshot_writes}
+    snapshot_writes += [
+        descriptor
+        for change_type, descriptor in changes
+        if change_type != "deleted_project" and descriptor["path"] not in written
+    ]
 
     updates_applied = 0
+    batch = _SyncBatch(db)
+    journal = MemoryJournal(PROJECTS_OVERVIEW, PROJECTS_OVERVIEW_HEADER)
+    brands: Dict[str, Any] = {}
     for change_type, descriptor in changes:
         if change_type == "deleted_project":
-            write_audit_log(
-                db,
-                actor_type="agent",
-                actor_id="filesystem_sync_agent",
-                action="project_deleted",
-                entity_type="project",
+            batch.audit(
+                "project_deleted",
+                "project",
+                {"path": descriptor.get("path")},
                 entity_id=descriptor.get("name"),
-                details={"path": descriptor.get("path")},
             )
             continue
 
         result = interpret_change(descriptor, change_type)
         summary: ProjectSummary = result["project_summary"]
         brand_slug = "tech" if summary.brand == "tech" else "records"
-        brand = get_brand_by_slug(db, brand_slug)
+        if brand_slug not in brands:
+            brands[brand_slug] = get_brand_by_slug(db, brand_slug)
+        brand = brands[brand_slug]
         if not brand:
             continue
 
-        project = _find_project_by_path(db, descriptor["path"])
+        path = descriptor["path"]
         meta = {
-            "filesystem_path": descriptor["path"],
+            "filesystem_path": path,
             "tags": summary.tags,
             "last_scan_time": datetime.utcnow().isoformat(),
             "inferred_properties": {
@@ -228,96 +629,120 @@ def run_filesystem_sync(db: Session, root_override: str | None = None) -> Dict[s
                 "last_modified": descriptor["last_modified"],
             },
         }
-
-        if project is None:
-            project = Project(
-                brand_id=brand.id,
-                name=summary.name,
-                type=summary.type,
-                stage=summary.status,
-                status=summary.status,
-                priority="medium",
-                meta=meta,
-            )
-            db.add(project)
-            db.commit()
-            db.refresh(project)
-            updates_applied += 1
-            write_audit_log(
-                db,
-                actor_type="agent",
-                actor_id="filesystem_sync_agent",
-                action="new_project_detected",
-                entity_type="project",
-                entity_id=str(project.id),
-                details={"path": descriptor["path"], "brand": summary.brand},
+        batch.projects.append(
+            {
+                "brand_id": brand.id,
+                "name": summary.name,
+                "type": summary.type,
+                "stage": summary.status,
+                "status": summary.status,
+                "priority": "medium",
+                "filesystem_path": path,
+                "meta": meta,
+            }
+        )
+        updates_applied += 1
+
+        if path not in batch.project_ids:
+            batch.audit(
+                "new_project_detected",
+                "project",
+                {"path": path, "brand": summary.brand},
+                project_path=path,
             )
             entry = (
                 f"- {datetime.utcnow().date()}: New {summary.brand} project '{summary.name}' "
                 f"— stage: {summary.status}"
             )
-            if _append_project_overview(entry):
-                write_audit_log(
-                    db,
-                    actor_type="agent",
-                    actor_id="filesystem_sync_agent",
-                    action="memory_updated",
-                    entity_type="memory",
-                    entity_id="projects_overview",
-                    details={"entry": entry},
-                )
+            journal.add(entry)
         else:
-            project.type = summary.type
-            project.stage = summary.status
-            project.status = summary.status
-            project.meta = meta
-            db.add(project)
-            db.commit()
-            db.refresh(project)
-            updates_applied += 1
-            write_audit_log(
-                db,
-                actor_type="agent",
-                actor_id="filesystem_sync_agent",
-                action="project_updated",
-                entity_type="project",
-                entity_id=str(project.id),
-                details={"path": descriptor["path"], "brand": summary.brand},
+            batch.audit(
+                "project_updated",
+                "project",
+                {
+                    "path": path,
+                    "brand": summary.brand,
+                    "changed_paths": descriptor.get("changed_paths", [])[:CHANGED_PATHS_AUDIT_LIMIT],
+                    "merged_events": descriptor.get("merged_events", 1),
+                },
+                project_path=path,
             )
 
         for task_payload in result["suggested_db_changes"].get("create_tasks", []):
-            _ensure_task(db, project.id, brand.id, task_payload)
+            batch.tasks.append((path, brand.id, task_payload))
         for item_payload in result["suggested_db_changes"].get("create_content_items", []):
-            _ensure_content_item(db, brand.id, project, item_payload)
+            batch.content_items.append((path, brand.id, item_payload))
 
-    snapshot = {
-        "last_scan": datetime.utcnow().isoformat(),
-        "projects": current,
-    }
-    _save_snapshot(snapshot)
+    batch.audit(
+        "filesystem_scan_completed",
+        "system",
+        {
+            "projects_scanned": projects_scanned,
+            "changes_detected": len(changes),
+            "updates_applied": updates_applied,
+            "directories_pruned": pruned_by_brand,
+            "changes_merged": changes_merged,
+            "changes_held": len(held),
+        },
+        entity_id="filesystem_sync",
+    )
+    batch.commit()
+
+    # Journal only what the database now holds; a failed commit above
+    # leaves projects_overview.md untouched.
+    memory_entries = list(journal.entries)
+    if journal.flush() and memory_entries:
+        write_audit_log(
+            db,
+            actor_type="agent",
+            actor_id="filesystem_sync_agent",
+            action="memory_updated",
+            entity_type="memory",
+            entity_id="projects_overview",
+            details={"entry_count": len(memory_entries), "entries": memory_entries[:MEMORY_AUDIT_ENTRY_LIMIT]},
+        )
+
+    store.apply(
+        snapshot_writes,
+        [descriptor["path"] for change_type, descriptor in changes if change_type == "deleted_project"],
+        datetime.utcnow().isoformat(),
+    )
+    if content_hasher is not None:
+        # Only a walk that visited every file knows which cache rows are stale.
+        content_hasher.flush(prune=dirty_paths is None and not settings.fs_sync_prune_unchanged_dirs)
 
     complete_ai_run(
         db,
         run,
-        output_summary=f"projects_scanned={len(current)}, changes={len(changes)}, updates={updates_applied}",
-    )
-
-    write_audit_log(
-        db,
-        actor_type="agent",
-        actor_id="filesystem_sync_agent",
-        action="filesystem_scan_completed",
-        entity_type="system",
-        entity_id="filesystem_sync",
-        details={
-            "projects_scanned": len(current),
-            "changes_detected": len(changes),
-            "updates_applied": updates_applied,
-        },
+        output_summary=(
+            f"projects_scanned={projects_scanned}, changes={len(changes)}, updates={updates_applied}, "
+            f"pruned_dirs={directories_pruned}"
+        ),
     )
 
     return {
-        "projects_scanned": len(current),
+        "projects_scanned": projects_scanned,
         "changes_detected": len(changes),
         "updates_applied": updates_applied,
+        "tasks_created": batch.tasks_created,
+        "content_items_created": batch.content_items_created,
+        "directories_pruned": directories_pruned,
+        "directories_pruned_by_brand": pruned_by_brand,
+        "changes_merged": changes_merged,
+        "changes_held": len(held),
+        "files_hashed": content_hasher.files_hashed if content_hasher is not None else 0,
     }
+
+
+def run_filesystem_sync_job(
+    dirty_paths: Iterable[str] | Dict[str, Set[str]] | None = None, debounce: bool = False
+) -> Dict[str, Any]:
+    with scan_lock(engine) as acquired:
+        if not acquired:
+            logger.info("filesystem_sync_skipped", extra={"extra": {"reason": "scan_in_progress"}})
+            return {"status": "skipped", "reason": "scan_in_progress"}
+        db = SessionLocal()
+        try:
+            return run_filesystem_sync(db, dirty_paths=dirty_paths, debounce=debounce)
+        finally:
+            db.close()
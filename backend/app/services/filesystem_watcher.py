@@ -0,0 +1,142 @@
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Set
+
+from ..logging.json_logger import get_logger
+from ..services.scan_ignore import ignore_rules
+
+logger = get_logger("filesystem_watcher")
+
+BRAND_FOLDERS = ("tech", "records")
+IGNORED_EVENT_TYPES = {"opened", "closed_no_write"}
+
+
+def project_path_for(root: Path, path: str) -> str | None:
+    try:
+        rel = Path(path).relative_to(root)
+    except ValueError:
+        return None
+    parts = rel.parts
+    if len(parts) < 2 or parts[0] not in BRAND_FOLDERS:
+        return None
+    return str(root / parts[0] / parts[1])
+
+
+# Native observer (inotify) by default; when it cannot start, e.g. when the
+# inotify watch limit is exhausted, start() returns False and the caller
+# falls back to interval scans. backend="polling" opts into a slow poller
+# that skips ignored directories, for mounts without change notifications.
+class FilesystemWatcher:
+    def __init__(self, root: Path, backend: str = "auto", poll_seconds: float = 300.0):
+        self.root = root
+        self.backend = backend
+        self.poll_seconds = poll_seconds
+        self._dirty: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._observer = None
+
+    # Blocks while the observer takes its initial snapshot or adds its
+    # watches; call it off the event loop.
+    def start(self) -> bool:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+            from watchdog.observers.polling import PollingObserverVFS
+        except ImportError:
+            logger.info("filesystem_watcher_unavailable", extra={"extra": {"reason": "watchdog_not_installed"}})
+            return False
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in IGNORED_EVENT_TYPES:
+                    return
+                directory_changed = event.is_directory and event.event_type == "modified"
+                watcher.mark_dirty(event.src_path, directory_changed)
+                dest_path = getattr(event, "dest_path", "")
+                if dest_path:
+                    watcher.mark_dirty(dest_path)
+
+        targets = [self.root / brand for brand in BRAND_FOLDERS if (self.root / brand).is_dir()]
+        if not targets:
+            logger.info("filesystem_watcher_unavailable", extra={"extra": {"reason": "no_brand_folders"}})
+            return False
+
+        if self.backend == "polling":
+            backend = "polling"
+            observer = PollingObserverVFS(os.stat, self._listdir, polling_interval=self.poll_seconds)
+        else:
+            backend = "native"
+            observer = Observer()
+        try:
+            for target in targets:
+                observer.schedule(_Handler(), str(target), recursive=True)
+            observer.start()
+        except OSError as exc:
+            # Emitters scheduled before the failure may already be running.
+            observer.stop()
+            if observer.is_alive():
+                observer.join(timeout=5)
+            logger.info("filesystem_watcher_backend_failed", extra={"extra": {"backend": backend, "error": str(exc)}})
+            return False
+        self._observer = observer
+        logger.info(
+            "filesystem_watcher_started",
+            extra={"extra": {"backend": backend, "targets": [str(t) for t in targets]}},
+        )
+        return True
+
+    # Directory listing for the polling observer with the project's scan
+    # ignore rules applied, so node_modules, .git and the like are never
+    # snapshotted or re-statted.
+    def _listdir(self, path: str) -> List[os.DirEntry]:
+        parts = Path(path).relative_to(self.root).parts
+        with os.scandir(path) as entries:
+            if len(parts) < 2 or parts[0] not in BRAND_FOLDERS:
+                return list(entries)
+            rules = ignore_rules(parts[0])
+            prefix = "/".join(parts[2:])
+            kept = []
+            for entry in entries:
+                rel_path = f"{prefix}/{entry.name}" if prefix else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if not rules.ignored(rel_path, is_dir=is_dir):
+                    kept.append(entry)
+            return kept
+
+    def stop(self) -> None:
+        if self._observer is None:
+            return
+        self._observer.stop()
+        self._observer.join(timeout=5)
+        self._observer = None
+
+    # Records the directory whose listing or file stats changed, relative to
+    # the project, so the rescan can reuse every other subtree.
+    def mark_dirty(self, path: str, directory_changed: bool = False) -> None:
+        project_path = project_path_for(self.root, path)
+        if project_path is None:
+            return
+        target = path if directory_changed else os.path.dirname(path)
+        rel_dir = os.path.relpath(target, project_path)
+        if rel_dir == "." or rel_dir.startswith(".."):
+            rel_dir = ""
+        with self._lock:
+            self._dirty.setdefault(project_path, set()).add(rel_dir)
+
+    def drain(self) -> Dict[str, Set[str]]:
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        return dirty
+
+    # Puts back paths from a drained batch that was never synced (the scan
+    # lock was held elsewhere, or the run failed), merged with newer events.
+    def requeue(self, dirty: Dict[str, Set[str]]) -> None:
+        with self._lock:
+            for project_path, rel_dirs in dirty.items():
+                self._dirty.setdefault(project_path, set()).update(rel_dirs)
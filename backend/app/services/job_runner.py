@@ -0,0 +1,132 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from ..logging.json_logger import get_logger
+
+logger = get_logger("jobs")
+
+
+@dataclass
+class Job:
+    id: str
+    name: str
+    status: str = "queued"
+    queued_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    duration_seconds: float | None = None
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+    coalesced: int = 0
+    coalesce_key: str | None = field(default=None, repr=False)
+    future: Future | None = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "queued_at": self.queued_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": self.duration_seconds,
+            "result": self.result,
+            "error": self.error,
+            "coalesced": self.coalesced,
+        }
+
+
+# Runs blocking jobs off the event loop on a dedicated thread pool and keeps
+# a bounded history of their state for /system/jobs.
+class JobRunner:
+    def __init__(self, max_workers: int = 1, history_size: int = 50):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jobs")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._history_size = history_size
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, func: Callable[..., Dict[str, Any] | None], *args, **kwargs) -> Job:
+        job = Job(id=str(uuid.uuid4()), name=name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    # Single-flight: a trigger for a job that is already queued or running
+    # returns that job instead of scheduling another run. Jobs only coalesce
+    # onto jobs submitted with the same coalesce_key (default: the name), so
+    # callers whose runs differ in effect can share a name without merging.
+    def submit_unique(
+        self,
+        name: str,
+        func: Callable[..., Dict[str, Any] | None],
+        *args,
+        coalesce_key: str | None = None,
+        **kwargs,
+    ) -> Job:
+        key = coalesce_key or name
+        with self._lock:
+            for job in reversed(self._jobs.values()):
+                if job.coalesce_key == key and job.status in {"queued", "running"}:
+                    job.coalesced += 1
+                    return job
+            job = Job(id=str(uuid.uuid4()), name=name, coalesce_key=key)
+            self._jobs[job.id] = job
+            self._trim()
+            job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, func: Callable[..., Dict[str, Any] | None], args, kwargs) -> Job:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        start = time.perf_counter()
+        try:
+            job.result = func(*args, **kwargs)
+            job.status = "finished"
+        except Exception as exc:
+            job.status = "failed"
+            job.error = str(exc)
+        job.duration_seconds = round(time.perf_counter() - start, 3)
+        job.finished_at = datetime.utcnow()
+        logger.info(
+            "job_completed",
+            extra={
+                "extra": {
+                    "job_id": job.id,
+                    "job_name": job.name,
+                    "status": job.status,
+                    "duration_seconds": job.duration_seconds,
+                    "error": job.error,
+                }
+            },
+        )
+        return job
+
+    def _trim(self) -> None:
+        while len(self._jobs) > self._history_size:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status in {"queued", "running"}:
+                break
+            del self._jobs[oldest_id]
+
+
+job_runner = JobRunner()
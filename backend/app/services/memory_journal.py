@@ -0,0 +1,46 @@
+import os
+from pathlib import Path
+from typing import List
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+# Collects markdown journal lines for one run and appends them in a single
+# O_APPEND write under an exclusive flock, so concurrent runs (threads or
+# worker processes) never interleave lines.
+class MemoryJournal:
+    def __init__(self, path: Path, header: str = ""):
+        self.path = path
+        self.header = header
+        self.entries: List[str] = []
+
+    def add(self, entry: str) -> None:
+        self.entries.append(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def flush(self) -> bool:
+        if not self.entries:
+            return True
+        payload = "".join(entry + "\n" for entry in self.entries)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                if os.fstat(fd).st_size == 0:
+                    payload = self.header + payload
+                data = memoryview(payload.encode("utf-8"))
+                while data:
+                    data = data[os.write(fd, data) :]
+            finally:
+                os.close(fd)
+        except OSError:
+            return False
+        self.entries = []
+        return True
@@ -2,7 +2,6 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List
 
-import httpx
 from sqlalchemy.orm import Session
 
 from ..config import settings
@@ -33,6 +32,8 @@ def sync_n8n_workflows(db: Session) -> Dict[str, Any]:
     if not settings.n8n_url or not settings.n8n_api_key:
         return {"status": "skipped", "reason": "n8n_api_disabled"}
 
+    import httpx
+
     run = start_ai_run(db, agent_name="system", input_summary="sync_n8n_workflows")
     workflows = _load_workflows()
     created = 0
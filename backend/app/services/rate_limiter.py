@@ -0,0 +1,179 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import yaml
+
+from ..config import settings
+from ..logging.json_logger import get_logger
+from ..metrics import record_rate_limit, record_rate_limit_evictions
+
+logger = get_logger("rate_limiter")
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CONFIG_PATH = REPO_ROOT / "config" / "security" / "rate_limits.yaml"
+REDIS_KEY_PREFIX = "43v3r:ratelimit:"
+
+# Used when rate_limits.yaml is not present (it is mounted into the
+# container from the repo's config/, not shipped with the backend), so the
+# login and ingest routes are never left unlimited.
+DEFAULT_RATE_LIMITS: Dict[str, Any] = {
+    "limits": {"ideas_ingest_per_minute": 30, "auth_login_per_minute": 10},
+    "routes": {"/ideas": "ideas_ingest_per_minute", "/auth/login": "auth_login_per_minute"},
+}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    name: str
+    requests: int
+    period_seconds: float = 60.0
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.requests / self.period_seconds
+
+
+# (allowed, seconds until the next request would be allowed)
+Decision = Tuple[bool, float]
+
+
+def _take(tokens: float, elapsed: float, limit: RateLimit) -> Tuple[float, Decision]:
+    tokens = min(float(limit.requests), tokens + elapsed * limit.refill_per_second)
+    if tokens >= 1:
+        return tokens - 1, (True, 0.0)
+    return tokens, (False, (1 - tokens) / limit.refill_per_second)
+
+
+# Token buckets in an LRU capped at max_keys. Evicting the least recently
+# seen client only forgets a bucket that has been refilling since, so memory
+# stays bounded under scanners without loosening limits for active clients.
+class MemoryBackend:
+    def __init__(self, max_keys: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: RateLimit) -> Decision:
+        now = self._clock()
+        evicted = 0
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(limit.requests), now))
+            tokens, decision = _take(tokens, now - updated, limit)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                evicted += 1
+        if evicted:
+            record_rate_limit_evictions(evicted)
+        return decision
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Same bucket as MemoryBackend, evaluated atomically on the server so every
+# worker shares it. Keys expire once the bucket would be full again.
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated, 0) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisBackend:
+    def __init__(self, url: str, client: Any = None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._client = client
+        self._script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    # Fails open: an unreachable limiter must not take the API down with it.
+    def hit(self, key: str, limit: RateLimit) -> Decision:
+        try:
+            allowed, retry_after = self._script(
+                keys=[REDIS_KEY_PREFIX + key], args=[limit.requests, limit.refill_per_second]
+            )
+        except Exception as exc:
+            logger.info("rate_limit_backend_error", extra={"extra": {"error": str(exc)}})
+            return True, 0.0
+        return bool(int(allowed)), float(retry_after)
+
+
+class RateLimiter:
+    def __init__(self, routes: Dict[str, RateLimit], backend):
+        self.routes = routes
+        self.backend = backend
+
+    # Seconds the client must wait when this request is over its limit,
+    # None when it may proceed or the path is not limited.
+    def check(self, path: str, client: str) -> Optional[float]:
+        limit = self.routes.get(path)
+        if limit is None:
+            return None
+        allowed, retry_after = self.backend.hit(f"{limit.name}:{client}", limit)
+        record_rate_limit(limit.name, allowed)
+        return None if allowed else retry_after
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(math.ceil(seconds), 1))
+
+
+def _parse_limit(name: str, value: Any) -> RateLimit:
+    if isinstance(value, dict):
+        return RateLimit(name, int(value["requests"]), float(value.get("period_seconds", 60)))
+    return RateLimit(name, int(value))
+
+
+def load_routes(config: Dict[str, Any]) -> Dict[str, RateLimit]:
+    limits = {name: _parse_limit(name, value) for name, value in (config.get("limits") or {}).items()}
+    routes: Dict[str, RateLimit] = {}
+    for path, name in (config.get("routes") or {}).items():
+        if name not in limits:
+            raise ValueError(f"rate limit route {path} references unknown limit {name}")
+        routes[path] = limits[name]
+    return routes
+
+
+def build_backend():
+    if settings.rate_limit_backend == "redis":
+        return RedisBackend(settings.rate_limit_redis_url)
+    if settings.rate_limit_backend != "memory":
+        raise ValueError(f"unknown rate limit backend {settings.rate_limit_backend}")
+    return MemoryBackend(settings.rate_limit_max_keys)
+
+
+def load_rate_limiter(config_path: Path = CONFIG_PATH) -> RateLimiter:
+    if config_path.exists():
+        config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+    else:
+        logger.warning(
+            "rate_limit_config_missing",
+            extra={"extra": {"path": str(config_path), "using": "built-in defaults"}},
+        )
+        config = DEFAULT_RATE_LIMITS
+    return RateLimiter(load_routes(config), build_backend())
@@ -0,0 +1,152 @@
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CONFIG_PATH = REPO_ROOT / "config" / "filesystem_sync" / "ignore.yaml"
+
+COMMON_IGNORE_PATTERNS = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".DS_Store",
+    "Thumbs.db",
+    ".Trash*/",
+]
+
+DEFAULT_IGNORE_PATTERNS: Dict[str, List[str]] = {
+    "tech": [
+        "node_modules/",
+        ".venv/",
+        "venv/",
+        "__pycache__/",
+        ".mypy_cache/",
+        ".pytest_cache/",
+        ".ruff_cache/",
+        ".tox/",
+        ".next/",
+        ".nuxt/",
+        ".turbo/",
+        ".gradle/",
+        "dist/",
+        "build/",
+        "target/",
+        "coverage/",
+        "*.egg-info/",
+    ],
+    "records": [
+        # Ableton: project backups, freeze/consolidate renders, analysis files
+        "Backup/",
+        "Samples/Processed/",
+        "*.asd",
+        # Logic / Pro Tools render caches
+        "Freeze Files/",
+        "Rendered Files/",
+        "Fade Files/",
+        # REAPER peak caches
+        "*.reapeaks",
+        "peaks/",
+    ],
+}
+
+
+def _glob_to_regex(pattern: str) -> str:
+    parts: List[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append("[" + body + "]")
+                i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+# Subset of .gitignore semantics: `#` comments, `!` negation, trailing `/`
+# for directories only, patterns with an inner `/` anchored to the project
+# root, `*`, `?`, `[...]` and `**`. The last matching pattern wins.
+class IgnoreRules:
+    def __init__(self, patterns: List[str]):
+        self.patterns = [p for p in (line.strip() for line in patterns) if p and not p.startswith("#")]
+        self.digest = hashlib.sha256("\n".join(self.patterns).encode("utf-8")).hexdigest()[:16]
+        self._rules: List[Tuple[re.Pattern, bool, bool, bool]] = []
+        for pattern in self.patterns:
+            negated = pattern.startswith("!")
+            if negated:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            anchored = "/" in pattern
+            regex = re.compile(_glob_to_regex(pattern.lstrip("/")) + r"\Z")
+            self._rules.append((regex, negated, dir_only, anchored))
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        rel_path = rel_path.replace("\\", "/")
+        name = rel_path.rsplit("/", 1)[-1]
+        result = False
+        for regex, negated, dir_only, anchored in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                result = not negated
+        return result
+
+
+def _load_config() -> Dict[str, Any]:
+    if not CONFIG_PATH.exists():
+        return {}
+    return yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8")) or {}
+
+
+def build_rules(brand: str, config: Dict[str, Any]) -> IgnoreRules:
+    patterns: List[str] = []
+    if config.get("use_defaults", True):
+        patterns += COMMON_IGNORE_PATTERNS + DEFAULT_IGNORE_PATTERNS.get(brand, [])
+    patterns += config.get("all") or []
+    patterns += (config.get("brands") or {}).get(brand) or []
+    return IgnoreRules(patterns)
+
+
+_cache: Dict[str, Any] = {"mtime_ns": None, "rules": {}}
+_cache_lock = threading.Lock()
+
+
+def ignore_rules(brand: str) -> IgnoreRules:
+    try:
+        mtime_ns = CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    with _cache_lock:
+        if _cache["mtime_ns"] != mtime_ns:
+            _cache["mtime_ns"] = mtime_ns
+            _cache["config"] = _load_config()
+            _cache["rules"] = {}
+        rules = _cache["rules"].get(brand)
+        if rules is None:
+            rules = _cache["rules"][brand] = build_rules(brand, _cache["config"])
+    return rules
@@ -0,0 +1,204 @@
+import json
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+SNAPSHOT_TRANSIENT_KEYS = {"files", "changed_paths", "tree_changed"}
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS snapshot_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS snapshot_projects (
+        path TEXT PRIMARY KEY,
+        brand TEXT NOT NULL,
+        name TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        descriptor BLOB NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS file_hashes (
+        inode INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        digest TEXT NOT NULL,
+        PRIMARY KEY (inode, size, mtime_ns)
+    )
+    """,
+]
+FILE_HASH_QUERY_CHUNK = 500
+
+
+def _encode(descriptor: Dict[str, Any]) -> bytes:
+    record = {key: value for key, value in descriptor.items() if key not in SNAPSHOT_TRANSIENT_KEYS}
+    return zlib.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def _decode(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+# Per-project snapshot records in a local SQLite file. index() only reads the
+# small columns; full descriptors (hash trees) are decoded on demand.
+class SnapshotStore:
+    def __init__(self, path: Path, legacy_path: Path | None = None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "SnapshotStore":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._import_legacy()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT path, brand, name, fingerprint FROM snapshot_projects").fetchall()
+        return {
+            path: {"path": path, "brand": brand, "name": name, "fingerprint": fingerprint}
+            for path, brand, name, fingerprint in rows
+        }
+
+    def get(self, path: str) -> Dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT descriptor FROM snapshot_projects WHERE path = ?", (path,)
+            ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def tree(self, path: str) -> Dict[str, Any] | None:
+        descriptor = self.get(path)
+        return descriptor.get("tree") if descriptor else None
+
+    def last_scan(self) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM snapshot_meta WHERE key = 'last_scan'").fetchone()
+        return row[0] if row else None
+
+    def apply(self, upserts: Iterable[Dict[str, Any]], deletes: Iterable[str], last_scan: str) -> None:
+        rows = [
+            (d["path"], d["brand"], d["name"], d["fingerprint"], _encode(d))
+            for d in upserts
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO snapshot_projects (path, brand, name, fingerprint, descriptor)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        brand = excluded.brand,
+                        name = excluded.name,
+                        fingerprint = excluded.fingerprint,
+                        descriptor = excluded.descriptor
+                    """,
+                    rows,
+                )
+                self._conn.executemany(
+                    "DELETE FROM snapshot_projects WHERE path = ?", [(path,) for path in deletes]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO snapshot_meta (key, value) VALUES ('last_scan', ?)", (last_scan,)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def file_hashes(self, keys: List[Tuple[int, int, int]]) -> Dict[Tuple[int, int, int], str]:
+        wanted = set(keys)
+        inodes = sorted({inode for inode, _, _ in wanted})
+        found: Dict[Tuple[int, int, int], str] = {}
+        with self._lock:
+            for offset in range(0, len(inodes), FILE_HASH_QUERY_CHUNK):
+                chunk = inodes[offset : offset + FILE_HASH_QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT inode, size, mtime_ns, digest FROM file_hashes WHERE inode IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for inode, size, mtime_ns, digest in rows:
+                    if (inode, size, mtime_ns) in wanted:
+                        found[(inode, size, mtime_ns)] = digest
+        return found
+
+    def put_file_hashes(self, rows: Iterable[Tuple[int, int, int, str]]) -> None:
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO file_hashes (inode, size, mtime_ns, digest) VALUES (?, ?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # Drops entries for files not seen by a complete scan, once stale rows
+    # outnumber live ones.
+    def prune_file_hashes(self, seen: Set[Tuple[int, int, int]]) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM file_hashes").fetchone()
+            if count <= 2 * len(seen):
+                return 0
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "CREATE TEMP TABLE seen_hashes (inode INTEGER, size INTEGER, mtime_ns INTEGER, "
+                    "PRIMARY KEY (inode, size, mtime_ns))"
+                )
+                self._conn.executemany("INSERT OR IGNORE INTO seen_hashes VALUES (?, ?, ?)", list(seen))
+                deleted = self._conn.execute(
+                    "DELETE FROM file_hashes WHERE (inode, size, mtime_ns) NOT IN "
+                    "(SELECT inode, size, mtime_ns FROM seen_hashes)"
+                ).rowcount
+                self._conn.execute("DROP TABLE seen_hashes")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return deleted
+
+    def _import_legacy(self) -> None:
+        if self.legacy_path is None or not self.legacy_path.exists():
+            return
+        imported = self._conn.execute(
+            "SELECT 1 FROM snapshot_meta WHERE key = 'legacy_imported'"
+        ).fetchone()
+        if imported:
+            return
+        try:
+            legacy = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+        except Exception:
+            legacy = {}
+        projects = legacy.get("projects", {})
+        self.apply(projects.values(), [], legacy.get("last_scan", ""))
+        self._conn.execute("INSERT OR REPLACE INTO snapshot_meta (key, value) VALUES ('legacy_imported', '1')")
@@ -0,0 +1,130 @@
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from ..logging.json_logger import get_logger
+
+logger = get_logger("sync_coordination")
+
+SCAN_LOCK_KEY = zlib.crc32(b"43v3r:filesystem_sync:scan")
+LEADER_LOCK_KEY = zlib.crc32(b"43v3r:filesystem_sync:leader")
+LEADER_CHECK_SECONDS = 30
+
+
+# Session-level Postgres advisory lock held on a dedicated connection. The
+# lock follows the connection, so a crashed worker releases it automatically.
+# Other databases (SQLite in tests) fall back to an in-process lock.
+class AdvisoryLock:
+    _local_locks: dict[int, threading.Lock] = {}
+    _local_guard = threading.Lock()
+
+    def __init__(self, engine: Engine, key: int):
+        self.engine = engine
+        self.key = key
+        self._conn: Connection | None = None
+        self._local_held = False
+
+    @property
+    def held(self) -> bool:
+        return self._conn is not None or self._local_held
+
+    def try_acquire(self) -> bool:
+        if self.held:
+            return True
+        if self.engine.dialect.name != "postgresql":
+            with self._local_guard:
+                lock = self._local_locks.setdefault(self.key, threading.Lock())
+            self._local_held = lock.acquire(blocking=False)
+            return self._local_held
+        conn = self.engine.connect()
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def is_alive(self) -> bool:
+        if self._local_held:
+            return True
+        if self._conn is None:
+            return False
+        try:
+            self._conn.execute(text("SELECT 1"))
+            self._conn.commit()
+            return True
+        except Exception:
+            self._drop()
+            return False
+
+    def release(self) -> None:
+        if self._local_held:
+            self._local_locks[self.key].release()
+            self._local_held = False
+            return
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._conn.commit()
+        finally:
+            self._drop()
+
+    def _drop(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+@contextmanager
+def scan_lock(engine: Engine) -> Iterator[bool]:
+    lock = AdvisoryLock(engine, SCAN_LOCK_KEY)
+    acquired = lock.try_acquire()
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            lock.release()
+
+
+# Only the worker holding the leader lock runs the scheduled sync loop.
+# Followers keep retrying so a new leader takes over if the old one exits.
+class LeaderElection:
+    def __init__(self, engine: Engine, key: int = LEADER_LOCK_KEY):
+        self._lock = AdvisoryLock(engine, key)
+        self._checked_at = 0.0
+
+    def ensure(self) -> bool:
+        now = time.monotonic()
+        if self._lock.held:
+            if now - self._checked_at < LEADER_CHECK_SECONDS:
+                return True
+            self._checked_at = now
+            if self._lock.is_alive():
+                return True
+            logger.info("filesystem_sync_leadership_lost", extra={"extra": {}})
+        try:
+            acquired = self._lock.try_acquire()
+        except Exception as exc:
+            logger.info("filesystem_sync_leader_check_failed", extra={"extra": {"error": str(exc)}})
+            return False
+        if acquired:
+            self._checked_at = now
+            logger.info("filesystem_sync_leader_elected", extra={"extra": {}})
+        return acquired
+
+    def resign(self) -> None:
+        self._lock.release()
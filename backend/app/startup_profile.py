@@ -0,0 +1,56 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from functools import wraps
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# Wall-clock timings for boot: imports, startup hooks and the deferred phase
+# that runs after the app is already serving. Reported as one log line per
+# phase; steps nest, so an import's time includes the imports it triggers.
+class StartupProfile:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.steps: List[Dict[str, Any]] = []
+
+    def record(self, phase: str, name: str, seconds: float) -> None:
+        self.steps.append({"phase": phase, "name": name, "ms": round(seconds * 1000, 1)})
+
+    @contextmanager
+    def step(self, phase: str, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, name, time.perf_counter() - start)
+
+    def import_module(self, name: str):
+        with self.step("import", name):
+            return import_module(name)
+
+    def hook(self, func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def timed_async(*args, **kwargs):
+                with self.step("startup", func.__name__):
+                    return await func(*args, **kwargs)
+
+            return timed_async
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            with self.step("startup", func.__name__):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def report(self, phases: Optional[List[str]] = None) -> Dict[str, Any]:
+        return {
+            "elapsed_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "steps": [step for step in self.steps if phases is None or step["phase"] in phases],
+        }
+
+
+startup_profile = StartupProfile()
@@ -0,0 +1,246 @@
+"""Filesystem sync benchmark.
+
+Generates synthetic /projects/tech and /projects/records trees and times
+_scan_root, _detect_changes and run_filesystem_sync against a local SQLite
+database. Cold runs have no snapshot or cached trees (the OS page cache is
+not dropped); warm runs repeat over the unchanged tree, with and without
+mtime-based subtree reuse, and sync once more after editing 1% of projects.
+Results are printed as JSON; peak_rss_mb is the process high-water mark
+after each phase.
+
+    cd backend && python -m benchmarks.filesystem_sync_bench --scale small
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+for key, value in {
+    "DATABASE_URL": "sqlite:///:memory:",
+    "VECTOR_DB_HOST": "localhost",
+    "VECTOR_DB_PORT": "6333",
+    "N8N_BASE_URL": "http://localhost:5678",
+    "OLLAMA_HOST": "http://localhost:11434",
+    "JWT_SECRET": "benchmark",
+    "FRONTEND_URL": "http://localhost:3000",
+}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.services.brand_service import ensure_brands  # noqa: E402
+import app.services.filesystem_sync as fs  # noqa: E402
+
+SCALES = {
+    "tiny": {"projects": 20, "files": 2_000},
+    "small": {"projects": 200, "files": 20_000},
+    "medium": {"projects": 1_000, "files": 100_000},
+    "large": {"projects": 10_000, "files": 1_000_000},
+}
+EDIT_FRACTION = 0.01
+# Files the benchmark writes next to projects/ in its workdir.
+BENCH_FILES = ["manifest.json", "bench.db", "snapshot.db", "snapshot.json", "projects_overview.md"]
+
+TECH_DIRS = ["src", "src/app", "src/app/api", "src/app/services", "src/lib", "tests", "tests/unit", "docs", "scripts"]
+TECH_EXTENSIONS = [
+    (".py", 30),
+    (".ts", 20),
+    (".tsx", 10),
+    (".js", 10),
+    (".json", 8),
+    (".md", 6),
+    (".css", 6),
+    (".yaml", 4),
+    (".sh", 3),
+    (".sql", 3),
+]
+TECH_PRUNED_DIRS = ["node_modules/pkg/lib", ".git/objects/ab", ".venv/lib/site-packages"]
+RECORDS_DIRS = ["Samples/Imported", "Samples/Recorded", "Stems", "Bounces", "Mixdowns", "MIDI", "Ableton Project Info"]
+RECORDS_EXTENSIONS = [
+    (".wav", 45),
+    (".aif", 10),
+    (".mid", 15),
+    (".als", 5),
+    (".mp3", 10),
+    (".flac", 5),
+    (".txt", 10),
+]
+RECORDS_PRUNED_DIRS = ["Backup", "Samples/Processed/Freeze"]
+
+
+def _weighted(rng: random.Random, choices: List[tuple]) -> str:
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+def generate_tree(root: Path, projects: int, files: int, seed: int = 43) -> Dict[str, int]:
+    rng = random.Random(seed)
+    per_project = max(files // projects, 1)
+    created = 0
+    for index in range(projects):
+        brand = "tech" if index % 2 == 0 else "records"
+        project = root / brand / f"{brand}_{index:05d}"
+        if brand == "tech":
+            dirs, extensions, pruned = TECH_DIRS, TECH_EXTENSIONS, TECH_PRUNED_DIRS
+            markers = ["README.md", rng.choice(["package.json", "pyproject.toml", "requirements.txt"])]
+        else:
+            dirs, extensions, pruned = RECORDS_DIRS, RECORDS_EXTENSIONS, RECORDS_PRUNED_DIRS
+            markers = [f"{project.name}{rng.choice(['', '_mix', '_master'])}.wav"]
+        for directory in dirs + pruned:
+            (project / directory).mkdir(parents=True, exist_ok=True)
+        for name in markers:
+            (project / name).write_bytes(b"x")
+        created += len(markers)
+        for file_index in range(per_project - len(markers)):
+            directory = rng.choice(dirs + pruned[:1]) if rng.random() < 0.9 else ""
+            name = f"f{file_index:05d}{_weighted(rng, extensions)}"
+            (project / directory / name).write_bytes(b"x" * rng.randint(0, 64))
+            created += 1
+    return {"projects": projects, "files": created}
+
+
+def edit_projects(root: Path, fraction: float, seed: int = 7) -> int:
+    rng = random.Random(seed)
+    projects = sorted(path for brand in ("tech", "records") for path in (root / brand).iterdir())
+    chosen = rng.sample(projects, max(int(len(projects) * fraction), 1))
+    for project in chosen:
+        (project / "bench_edit.txt").write_text(str(time.time()), encoding="utf-8")
+    return len(chosen)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _timed(name: str, files: int, func: Callable[[], Any]) -> tuple:
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    return value, {
+        "phase": name,
+        "seconds": round(seconds, 4),
+        "files_per_second": round(files / seconds, 1) if seconds else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_benchmark(workdir: Path, scale: str, seed: int) -> Dict[str, Any]:
+    spec = SCALES[scale]
+    root = workdir / "projects"
+    manifest_path = workdir / "manifest.json"
+    if not manifest_path.exists() and workdir.exists() and any(workdir.iterdir()):
+        raise ValueError(f"{workdir} is not empty and has no benchmark manifest.json; refusing to overwrite it")
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    if manifest.get("scale") != scale or manifest.get("seed") != seed:
+        # Only remove what a previous benchmark run created in this workdir.
+        shutil.rmtree(root, ignore_errors=True)
+        for name in BENCH_FILES:
+            (workdir / name).unlink(missing_ok=True)
+        root.mkdir(parents=True)
+        generated, generate_phase = _timed(
+            "generate", spec["files"], lambda: generate_tree(root, spec["projects"], spec["files"], seed)
+        )
+        manifest = {"scale": scale, "seed": seed, **generated, "generate_seconds": generate_phase["seconds"]}
+        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    files = manifest["files"]
+
+    fs.ALLOWED_ROOT = root.resolve()
+    fs.SNAPSHOT_PATH = workdir / "snapshot.db"
+    fs.LEGACY_SNAPSHOT_PATH = workdir / "snapshot.json"
+    fs.PROJECTS_OVERVIEW = workdir / "projects_overview.md"
+    for stale in (fs.SNAPSHOT_PATH, workdir / "bench.db", fs.PROJECTS_OVERVIEW):
+        stale.unlink(missing_ok=True)
+    for edited in root.glob("*/*/bench_edit.txt"):
+        edited.unlink()
+
+    phases: List[Dict[str, Any]] = []
+
+    current, phase = _timed("scan_cold", files, lambda: fs._scan_root(root))
+    phases.append(phase)
+    trees = {path: descriptor["tree"] for path, descriptor in current.items()}
+    _, phase = _timed("scan_warm", files, lambda: fs._scan_root(root, trees.get))
+    phases.append(phase)
+    prune_setting = settings.fs_sync_prune_unchanged_dirs
+    settings.fs_sync_prune_unchanged_dirs = True
+    try:
+        _, phase = _timed("scan_warm_pruned", files, lambda: fs._scan_root(root, trees.get))
+    finally:
+        settings.fs_sync_prune_unchanged_dirs = prune_setting
+    phases.append(phase)
+
+    previous = {path: {"fingerprint": d["fingerprint"]} for path, d in current.items()}
+    (changes, _, _), phase = _timed("detect_unchanged", files, lambda: fs._detect_changes(current.values(), previous))
+    phases.append({**phase, "changes": len(changes)})
+
+    engine = create_engine(f"sqlite:///{workdir / 'bench.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    ensure_brands(db)
+    try:
+        for name in ("sync_cold", "sync_warm"):
+            result, phase = _timed(name, files, lambda: fs.run_filesystem_sync(db, root_override=str(root)))
+            phases.append({**phase, "changes": result["changes_detected"]})
+        edited = edit_projects(root, EDIT_FRACTION)
+        result, phase = _timed("sync_after_edit", files, lambda: fs.run_filesystem_sync(db, root_override=str(root)))
+        phases.append({**phase, "changes": result["changes_detected"], "projects_edited": edited})
+    finally:
+        db.close()
+        engine.dispose()
+
+    return {
+        "benchmark": "filesystem_sync",
+        "timestamp": datetime.utcnow().isoformat(),
+        "scale": scale,
+        "projects": manifest["projects"],
+        "files": files,
+        "settings": {
+            "scan_workers": settings.fs_sync_scan_workers,
+            "prune_unchanged_dirs": settings.fs_sync_prune_unchanged_dirs,
+            "fingerprint_mode": settings.fs_sync_fingerprint_mode,
+        },
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "phases": phases,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--workdir", type=Path, help="reuse a generated tree between runs")
+    parser.add_argument("--seed", type=int, default=43)
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="fs-sync-bench-"))
+    try:
+        report = run_benchmark(workdir.resolve(), args.scale, args.seed)
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
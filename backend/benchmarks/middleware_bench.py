@@ -0,0 +1,185 @@
+"""Request middleware benchmark.
+
+Drives a small FastAPI app directly over ASGI (no server, no sockets) and
+reports requests per second for the request middleware implemented as a
+BaseHTTPMiddleware (how request_logger used to be registered) and as the
+plain ASGI RequestMiddleware. Both run identical logging, rate limiting and
+metrics code; the log line goes to /dev/null.
+
+    cd backend && python -m benchmarks.middleware_bench --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict
+
+for key, value in {
+    "DATABASE_URL": "sqlite:///:memory:",
+    "VECTOR_DB_HOST": "localhost",
+    "VECTOR_DB_PORT": "6333",
+    "N8N_BASE_URL": "http://localhost:5678",
+    "OLLAMA_HOST": "http://localhost:11434",
+    "JWT_SECRET": "benchmark",
+    "FRONTEND_URL": "http://localhost:3000",
+}.items():
+    os.environ.setdefault(key, value)
+
+from fastapi import FastAPI  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app.db_stats import stop_tracking, track_request  # noqa: E402
+from app.metrics import method_label, record_request, record_request_db, route_path_label  # noqa: E402
+from app.middleware import RequestMiddleware, logger  # noqa: E402
+from app.services.rate_limiter import (  # noqa: E402
+    MemoryBackend,
+    RateLimit,
+    RateLimiter,
+    retry_after_header,
+)
+
+PATHS = ["/", "/health/db", "/system/workflow_event"]
+
+
+def _limiter() -> RateLimiter:
+    return RateLimiter({"/auth/login": RateLimit("auth_login_per_minute", 10)}, MemoryBackend())
+
+
+def _base_http_middleware(limiter: RateLimiter):
+    async def request_logger(request, call_next):
+        ip = request.client.host if request.client else "unknown"
+        retry_after = limiter.check(request.url.path, ip)
+        if retry_after is not None:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded"},
+                headers={"retry-after": retry_after_header(retry_after)},
+            )
+        correlation_id = request.headers.get("x-correlation-id", str(uuid.uuid4()))
+        request.state.correlation_id = correlation_id
+        db_stats, token = track_request(correlation_id)
+        start_time = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            stop_tracking(token)
+        duration = time.perf_counter() - start_time
+        logger.info(
+            "request",
+            extra={
+                "extra": {
+                    "correlation_id": correlation_id,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status_code": response.status_code,
+                    "db_queries": db_stats.queries,
+                    "db_time_ms": db_stats.duration_ms,
+                }
+            },
+        )
+        method, path_label = method_label(request.method), route_path_label(request.scope)
+        record_request(method, path_label, response.status_code, duration)
+        record_request_db(method, path_label, db_stats.queries, db_stats.duration_seconds)
+        response.headers["x-correlation-id"] = correlation_id
+        return response
+
+    return request_logger
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    def root():
+        return {"status": "ok"}
+
+    @app.get("/health/db")
+    def health_db():
+        return {"status": "ok", "db": "ok"}
+
+    @app.post("/system/workflow_event")
+    async def workflow_event():
+        return {"status": "recorded"}
+
+    if variant == "base_http":
+        app.add_middleware(BaseHTTPMiddleware, dispatch=_base_http_middleware(_limiter()))
+    elif variant == "asgi":
+        app.add_middleware(RequestMiddleware, rate_limiter=_limiter())
+    return app
+
+
+async def _drive(app, path: str, requests: int) -> float:
+    method = "POST" if path == "/system/workflow_event" else "GET"
+    body = {"type": "http.request", "body": b"", "more_body": False}
+
+    async def receive():
+        return body
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+        }
+        await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+async def run_benchmark(requests: int) -> Dict[str, Any]:
+    results = []
+    for variant in ("none", "base_http", "asgi"):
+        app = build_app(variant)
+        await _drive(app, "/", 200)
+        for path in PATHS:
+            seconds = await _drive(app, path, requests)
+            results.append(
+                {
+                    "variant": variant,
+                    "path": path,
+                    "requests": requests,
+                    "seconds": round(seconds, 4),
+                    "requests_per_second": round(requests / seconds, 1),
+                }
+            )
+    return {
+        "benchmark": "request_middleware",
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="requests per path and variant")
+    args = parser.parse_args()
+    with open(os.devnull, "w") as devnull:
+        for handler in logger.handlers:
+            handler.setStream(devnull)
+        report = asyncio.run(run_benchmark(args.requests))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
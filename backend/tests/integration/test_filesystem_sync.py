@@ -1,11 +1,15 @@
+import os
 from pathlib import Path
-from sqlalchemy import create_engine
+
+import pytest
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.database import Base
 from app.services.brand_service import ensure_brands
 from app.services.filesystem_sync import run_filesystem_sync
-from app.models import Project
+from app.models import Project, Task
+from app.ai.filesystem_sync_agent import features_from_files
 import app.services.filesystem_sync as fs
 
 
@@ -28,7 +32,7 @@ def test_new_tech_project_creates_project(tmp_path: Path):
     (tech / "tests" / "test_basic.py").write_text("def test_ok():\n    assert True\n", encoding="utf-8")
 
     fs.ALLOWED_ROOT = root.resolve()
-    fs.SNAPSHOT_PATH = tmp_path / "snapshot.json"
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
 
     db = _setup_db()
     result = run_filesystem_sync(db, root_override=str(root))
@@ -46,7 +50,7 @@ def test_new_records_project_detects_release(tmp_path: Path):
     (records / "night_drive_master.wav").write_text("x", encoding="utf-8")
 
     fs.ALLOWED_ROOT = root.resolve()
-    fs.SNAPSHOT_PATH = tmp_path / "snapshot.json"
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
 
     db = _setup_db()
     result = run_filesystem_sync(db, root_override=str(root))
@@ -55,3 +59,259 @@ def test_new_records_project_detects_release(tmp_path: Path):
     projects = db.query(Project).all()
     assert len(projects) == 1
     assert projects[0].status == "ready_for_release"
+
+
+def test_dirty_paths_only_rescan_listed_projects(tmp_path: Path):
+    root = tmp_path / "projects"
+    alpha = root / "tech" / "alpha"
+    beta = root / "tech" / "beta"
+    alpha.mkdir(parents=True)
+    beta.mkdir(parents=True)
+    (alpha / "README.md").write_text("Alpha", encoding="utf-8")
+    (beta / "README.md").write_text("Beta", encoding="utf-8")
+
+    fs.ALLOWED_ROOT = root.resolve()
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
+
+    db = _setup_db()
+    run_filesystem_sync(db, root_override=str(root))
+
+    (alpha / "tests").mkdir()
+    (alpha / "tests" / "test_alpha.py").write_text("def test_ok():\n    assert True\n", encoding="utf-8")
+    (beta / "main.py").write_text("print('beta')", encoding="utf-8")
+
+    result = run_filesystem_sync(db, root_override=str(root), dirty_paths={str(alpha.resolve())})
+
+    assert result["projects_scanned"] == 1
+    assert result["changes_detected"] == 1
+    statuses = {project.name: project.status for project in db.query(Project).all()}
+    assert statuses == {"alpha": "ready_for_demo", "beta": "wip"}
+
+
+def test_rescan_reports_changed_subpaths_and_reuses_clean_subtrees(tmp_path: Path):
+    project = tmp_path / "projects" / "records" / "night_drive"
+    (project / "stems").mkdir(parents=True)
+    (project / "bounces").mkdir()
+    (project / "stems" / "kick.wav").write_text("kick", encoding="utf-8")
+    (project / "bounces" / "v1.wav").write_text("v1", encoding="utf-8")
+
+    first = fs._scan_project_dir(project, "records")
+    (project / "stems" / "kick.wav").write_text("kick, louder", encoding="utf-8")
+
+    untouched = fs._scan_project_dir(project, "records", first["tree"], dirty_dirs=set())
+    assert untouched["tree"] is first["tree"]
+
+    rescanned = fs._scan_project_dir(project, "records", first["tree"], dirty_dirs={"stems"})
+    assert rescanned["fingerprint"] != first["fingerprint"]
+    assert rescanned["changed_paths"] == ["stems"]
+    assert rescanned["tree"]["dirs"]["bounces"] is first["tree"]["dirs"]["bounces"]
+    assert rescanned["features"] == first["features"]
+
+
+def test_scan_features_match_flat_file_list(tmp_path: Path):
+    project = tmp_path / "projects" / "tech" / "cli"
+    (project / "src" / "tests").mkdir(parents=True)
+    (project / "Mixdowns").mkdir()
+    (project / "empty_tests").mkdir()
+    files = ["README.md", "pyproject.toml", "run.SH", "src/app.py", "src/tests/test_app.py", "Mixdowns/a.txt"]
+    for name in files:
+        (project / name).write_text("x", encoding="utf-8")
+
+    descriptor = fs._scan_project_dir(project, "tech")
+
+    assert descriptor["features"] == features_from_files(files)
+    assert descriptor["features"]["ext"][".sh"] == 1
+    assert descriptor["features"]["has_mix"] is True
+    assert "files" not in descriptor
+
+
+def test_resync_updates_projects_without_duplicating_tasks(tmp_path: Path):
+    root = tmp_path / "projects"
+    for name in ["one", "two", "three"]:
+        project = root / "tech" / name
+        project.mkdir(parents=True)
+        (project / "main.py").write_text("print('hi')", encoding="utf-8")
+
+    fs.ALLOWED_ROOT = root.resolve()
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
+
+    db = _setup_db()
+    run_filesystem_sync(db, root_override=str(root))
+    assert db.query(Task).count() == 6
+
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(session))
+    for name in ["one", "two", "three"]:
+        (root / "tech" / name / "README.md").write_text("Readme", encoding="utf-8")
+    result = run_filesystem_sync(db, root_override=str(root))
+
+    assert result["updates_applied"] == 3
+    assert result["tasks_created"] == 0
+    assert db.query(Task).count() == 6
+    assert {project.status for project in db.query(Project).all()} == {"wip"}
+    assert len(commits) <= 3
+
+
+def test_ignored_directories_are_pruned_and_counted(tmp_path: Path):
+    root = tmp_path / "projects"
+    tech = root / "tech" / "web"
+    (tech / "node_modules" / "left-pad").mkdir(parents=True)
+    (tech / "node_modules" / "left-pad" / "index.js").write_text("x", encoding="utf-8")
+    (tech / ".git").mkdir()
+    (tech / "package.json").write_text("{}", encoding="utf-8")
+    records = root / "records" / "tape"
+    (records / "Samples" / "Processed" / "Freeze").mkdir(parents=True)
+    (records / "Samples" / "Processed" / "Freeze" / "tape_mix.wav").write_text("x", encoding="utf-8")
+    (records / "tape.wav").write_text("x", encoding="utf-8")
+
+    fs.ALLOWED_ROOT = root.resolve()
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
+
+    db = _setup_db()
+    result = run_filesystem_sync(db, root_override=str(root))
+
+    assert result["directories_pruned"] == 3
+    assert result["directories_pruned_by_brand"] == {"tech": 2, "records": 1}
+    tape = db.query(Project).filter(Project.name == "tape").one()
+    assert tape.status == "production"
+    assert tape.meta["inferred_properties"]["file_count"] == 1
+
+
+def test_debounced_sync_holds_changes_until_quiet(tmp_path: Path, monkeypatch):
+    from app.services.change_debounce import ChangeDebouncer
+
+    root = tmp_path / "projects"
+    project = root / "records" / "bounce"
+    project.mkdir(parents=True)
+    (project / "take1.wav").write_text("x", encoding="utf-8")
+
+    fs.ALLOWED_ROOT = root.resolve()
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
+    clock = [0.0]
+    monkeypatch.setattr(fs, "change_debouncer", ChangeDebouncer(30, clock=lambda: clock[0]))
+
+    db = _setup_db()
+    first = run_filesystem_sync(db, root_override=str(root), debounce=True)
+    assert first["changes_detected"] == 0
+    assert first["changes_held"] == 1
+
+    clock[0] = 10.0
+    (project / "take1_mix.wav").write_text("x", encoding="utf-8")
+    second = run_filesystem_sync(db, root_override=str(root), debounce=True)
+    assert second["changes_held"] == 1
+    assert second["changes_merged"] == 1
+    assert db.query(Project).count() == 0
+
+    clock[0] = 45.0
+    third = run_filesystem_sync(db, root_override=str(root), debounce=True)
+    assert third["changes_detected"] == 1
+    assert third["changes_held"] == 0
+    assert db.query(Project).one().status == "mix"
+
+    fourth = run_filesystem_sync(db, root_override=str(root), debounce=True)
+    assert fourth["changes_detected"] == 0
+    assert fourth["changes_held"] == 0
+
+
+def test_content_mode_detects_mtime_preserving_edits(tmp_path: Path, monkeypatch):
+    root = tmp_path / "projects"
+    project = root / "records" / "stems"
+    project.mkdir(parents=True)
+    stem = project / "bass.wav"
+    stem.write_bytes(b"take one")
+    stat = stem.stat()
+
+    fs.ALLOWED_ROOT = root.resolve()
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
+    monkeypatch.setattr(fs.settings, "fs_sync_fingerprint_mode", "content")
+
+    db = _setup_db()
+    first = run_filesystem_sync(db, root_override=str(root))
+    assert first["files_hashed"] == 1
+
+    unchanged = run_filesystem_sync(db, root_override=str(root))
+    assert unchanged["changes_detected"] == 0
+    assert unchanged["files_hashed"] == 0
+
+    # rsync -t style: new file with the old size and mtime renamed over the old one
+    incoming = project / ".bass.wav.tmp"
+    incoming.write_bytes(b"take two")
+    os.utime(incoming, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    incoming.replace(stem)
+    changed = run_filesystem_sync(db, root_override=str(root))
+    assert changed["changes_detected"] == 1
+
+
+def test_new_projects_are_journaled_in_one_write(tmp_path: Path, monkeypatch):
+    from app.models import AuditLog
+
+    root = tmp_path / "projects"
+    for name in ["one", "two", "three"]:
+        (root / "tech" / name).mkdir(parents=True)
+        (root / "tech" / name / "README.md").write_text(name, encoding="utf-8")
+
+    fs.ALLOWED_ROOT = root.resolve()
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
+    monkeypatch.setattr(fs, "PROJECTS_OVERVIEW", tmp_path / "memory" / "projects_overview.md")
+
+    db = _setup_db()
+    run_filesystem_sync(db, root_override=str(root))
+
+    lines = fs.PROJECTS_OVERVIEW.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "# Projects Overview"
+    assert sum(1 for line in lines if line.startswith("- ")) == 3
+    memory_audits = db.query(AuditLog).filter(AuditLog.action == "memory_updated").all()
+    assert len(memory_audits) == 1
+    assert memory_audits[0].details["entry_count"] == 3
+
+
+def test_journal_is_not_written_when_the_batch_commit_fails(tmp_path: Path, monkeypatch):
+    root = tmp_path / "projects"
+    (root / "tech" / "one").mkdir(parents=True)
+    (root / "tech" / "one" / "README.md").write_text("one", encoding="utf-8")
+
+    fs.ALLOWED_ROOT = root.resolve()
+    fs.SNAPSHOT_PATH = tmp_path / "snapshot.db"
+    monkeypatch.setattr(fs, "PROJECTS_OVERVIEW", tmp_path / "memory" / "projects_overview.md")
+
+    def failing_commit(self):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(fs._SyncBatch, "commit", failing_commit)
+    db = _setup_db()
+    with pytest.raises(RuntimeError):
+        run_filesystem_sync(db, root_override=str(root))
+
+    assert not fs.PROJECTS_OVERVIEW.exists()
+
+
+def test_parallel_scan_releases_results_as_they_are_consumed(monkeypatch):
+    import gc
+    import threading
+    import weakref
+
+    class Descriptor(dict):
+        pass
+
+    started = []
+    lock = threading.Lock()
+
+    def fake_scan(target, load_tree, content_hasher=None):
+        with lock:
+            started.append(target[0])
+        return Descriptor(path=str(target[0]), payload=bytearray(1024))
+
+    monkeypatch.setattr(fs.settings, "fs_sync_scan_workers", 2)
+    monkeypatch.setattr(fs, "_scan_target", fake_scan)
+    targets = [(Path(f"/p/tech/{index}"), "tech", None) for index in range(20)]
+
+    results = fs._iter_scan_projects(targets, fs._no_previous_tree)
+    refs = []
+    for descriptor in results:
+        if not refs:
+            assert len(started) <= 4
+        refs.append(weakref.ref(descriptor))
+        del descriptor
+        gc.collect()
+        assert all(ref() is None for ref in refs)
+    assert len(refs) == 20
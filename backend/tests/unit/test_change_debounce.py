@@ -0,0 +1,51 @@
+from app.services.change_debounce import ChangeDebouncer
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _change(path, fingerprint, change_type="updated_project", changed_paths=None):
+    return change_type, {"path": str(path), "fingerprint": fingerprint, "changed_paths": changed_paths or []}
+
+
+def test_burst_is_emitted_once_after_quiet_window(tmp_path):
+    clock = _Clock()
+    debouncer = ChangeDebouncer(5, clock=clock)
+
+    for second, fingerprint in enumerate(["a", "b", "c"]):
+        clock.now = float(second)
+        emitted, _ = debouncer.settle([_change(tmp_path, fingerprint, changed_paths=[fingerprint])], None)
+        assert emitted == []
+    clock.now = 4.0
+    assert debouncer.settle([_change(tmp_path, "c")], None) == ([], 0)
+    assert debouncer.next_due_in() == 3.0
+
+    clock.now = 7.0
+    emitted, merged = debouncer.settle([], {"other"})
+    assert merged == 0
+    assert len(emitted) == 1
+    change_type, descriptor = emitted[0]
+    assert change_type == "updated_project"
+    assert descriptor["fingerprint"] == "c"
+    assert descriptor["merged_events"] == 3
+    assert descriptor["changed_paths"] == ["a", "b", "c"]
+    assert debouncer.held_paths() == set()
+
+
+def test_reverted_change_is_dropped_and_force_flushes(tmp_path):
+    clock = _Clock()
+    debouncer = ChangeDebouncer(5, clock=clock)
+
+    debouncer.settle([_change(tmp_path / "gone", "a", "new_project")], None)
+    emitted, merged = debouncer.settle([_change(tmp_path, "a")], None)
+    assert emitted == []
+    assert merged == 1
+    assert debouncer.held_paths() == {str(tmp_path)}
+
+    emitted, _ = debouncer.settle([], set(), force=True)
+    assert [change_type for change_type, _ in emitted] == ["updated_project"]
@@ -0,0 +1,53 @@
+import os
+from pathlib import Path
+
+from app.services.content_hash import SAMPLE_BLOCK_BYTES, ContentHasher, file_digest
+from app.services.snapshot_store import SnapshotStore
+
+
+def test_large_files_are_sampled_small_files_fully_hashed(tmp_path: Path):
+    big = tmp_path / "stem.wav"
+    big.write_bytes(b"a" * (SAMPLE_BLOCK_BYTES * 4))
+    before = file_digest(str(big), big.stat().st_size, full_hash_bytes=1024)
+
+    with big.open("r+b") as handle:
+        handle.seek(SAMPLE_BLOCK_BYTES * 2 - 10)
+        handle.write(b"b")
+    assert file_digest(str(big), big.stat().st_size, full_hash_bytes=1024) != before
+
+    small = tmp_path / "notes.txt"
+    small.write_bytes(b"x" * 100)
+    assert file_digest(str(small), 100, full_hash_bytes=1024) != file_digest(str(big), 100, full_hash_bytes=1024)
+
+
+def test_files_below_the_sample_size_hash_with_a_small_full_hash_limit(tmp_path: Path):
+    mid = tmp_path / "loop.wav"
+    mid.write_bytes(b"c" * (SAMPLE_BLOCK_BYTES // 2))
+    before = file_digest(str(mid), mid.stat().st_size, full_hash_bytes=1024)
+
+    with mid.open("r+b") as handle:
+        handle.seek(100)
+        handle.write(b"d")
+    assert file_digest(str(mid), mid.stat().st_size, full_hash_bytes=1024) != before
+
+
+def test_cached_digests_are_not_recomputed(tmp_path: Path):
+    (tmp_path / "a.wav").write_bytes(b"one")
+    stat = os.stat(tmp_path / "a.wav")
+
+    with SnapshotStore(tmp_path / "snapshot.db") as store:
+        first = ContentHasher(store)
+        digests = first.digests(str(tmp_path), [("a.wav", stat)])
+        first.flush()
+        assert first.files_hashed == 1
+
+        second = ContentHasher(store)
+        assert second.digests(str(tmp_path), [("a.wav", stat)]) == digests
+        assert second.files_hashed == 0
+
+        store.put_file_hashes([(stat.st_ino + 1, 1, 1, "stale"), (stat.st_ino + 2, 1, 1, "stale")])
+        second.flush(prune=True)
+        assert store.file_hashes([(stat.st_ino + 1, 1, 1)]) == {}
+        assert store.file_hashes([(stat.st_ino, stat.st_size, stat.st_mtime_ns)]) == {
+            (stat.st_ino, stat.st_size, stat.st_mtime_ns): digests["a.wav"]
+        }
@@ -0,0 +1,117 @@
+from sqlalchemy import create_engine, event, inspect, text
+
+from app import db_bootstrap
+
+
+def test_create_schema_skips_ddl_once_hash_matches(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        db_bootstrap,
+        "BOOTSTRAP_SQL",
+        [
+            "CREATE TABLE IF NOT EXISTS brands (id INTEGER PRIMARY KEY, slug TEXT NOT NULL UNIQUE);",
+            "INSERT INTO brands (slug) SELECT 'tech' WHERE NOT EXISTS (SELECT 1 FROM brands WHERE slug = 'tech');",
+        ],
+    )
+    engine = create_engine(f"sqlite:///{tmp_path / 'bootstrap.db'}")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    assert db_bootstrap.create_schema_if_needed(engine) is True
+    assert {"brands", "schema_meta"} <= set(inspect(engine).get_table_names())
+
+    statements.clear()
+    assert db_bootstrap.create_schema_if_needed(engine) is False
+    assert len(statements) == 1 and statements[0].lstrip().startswith("SELECT value FROM schema_meta")
+
+    monkeypatch.setattr(
+        db_bootstrap,
+        "BOOTSTRAP_SQL",
+        db_bootstrap.BOOTSTRAP_SQL + ["ALTER TABLE brands ADD COLUMN name TEXT;"],
+    )
+    assert db_bootstrap.create_schema_if_needed(engine) is True
+    assert db_bootstrap.create_schema_if_needed(engine) is False
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT value FROM schema_meta")).scalar() == db_bootstrap.schema_hash()
+        assert conn.execute(text("SELECT count(*) FROM brands")).scalar() == 1
+
+
+def test_project_path_dedupe_keeps_lowest_id_and_moves_tasks(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dedupe.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE projects (id INTEGER PRIMARY KEY, filesystem_path TEXT, meta TEXT)"))
+        conn.execute(text("CREATE TABLE tasks (id INTEGER PRIMARY KEY, project_id INTEGER, title TEXT, source TEXT)"))
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX uq_tasks_filesystem_sync_project_title ON tasks (project_id, title) "
+                "WHERE source = 'filesystem_sync'"
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO projects (id, filesystem_path, meta) VALUES
+                (1, NULL, '{"filesystem_path": "/p/tech/a"}'),
+                (2, '/p/tech/a', '{"filesystem_path": "/p/tech/a"}'),
+                (3, NULL, '{"filesystem_path": "/p/tech/a"}'),
+                (4, NULL, '{"filesystem_path": "/p/tech/b"}'),
+                (5, NULL, '{}')
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO tasks (id, project_id, title, source) VALUES
+                (1, 2, 'x', 'manual'), (2, 3, 'y', 'manual'), (3, 4, 'z', 'manual'),
+                (4, 1, 'Add README', 'filesystem_sync'), (5, 2, 'Add README', 'filesystem_sync'),
+                (6, 2, 'Add tests', 'filesystem_sync'), (7, 3, 'Add tests', 'filesystem_sync')
+                """
+            )
+        )
+
+        for statement in db_bootstrap.PROJECT_PATH_DEDUPE_SQL:
+            conn.execute(text(statement))
+        conn.execute(text("CREATE UNIQUE INDEX uq_projects_filesystem_path ON projects (filesystem_path)"))
+        # Re-applying after a schema change must not refill the duplicates.
+        for statement in db_bootstrap.PROJECT_PATH_DEDUPE_SQL:
+            conn.execute(text(statement))
+
+        paths = dict(conn.execute(text("SELECT id, filesystem_path FROM projects")).all())
+        tasks = dict(conn.execute(text("SELECT id, project_id FROM tasks")).all())
+    assert paths == {1: "/p/tech/a", 2: None, 3: None, 4: "/p/tech/b", 5: None}
+    assert tasks == {1: 1, 2: 1, 3: 4, 4: 1, 6: 1}
+
+
+def test_sync_row_dedupe_keeps_first_filesystem_sync_row(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rows.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE tasks (id INTEGER PRIMARY KEY, project_id INTEGER, title TEXT, source TEXT)"))
+        conn.execute(text("CREATE TABLE content_items (id INTEGER PRIMARY KEY, title TEXT, source TEXT)"))
+        conn.execute(
+            text(
+                """
+                INSERT INTO tasks (id, project_id, title, source) VALUES
+                (1, 1, 'Write tests', 'filesystem_sync'),
+                (2, 1, 'Write tests', 'filesystem_sync'),
+                (3, 1, 'Write tests', 'manual'),
+                (4, NULL, 'Loose', 'filesystem_sync'),
+                (5, NULL, 'Loose', 'filesystem_sync')
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO content_items (id, title, source) VALUES
+                (1, 'Release: night', 'filesystem_sync'),
+                (2, 'Release: night', 'filesystem_sync'),
+                (3, 'Release: night', 'manual')
+                """
+            )
+        )
+        for statement in db_bootstrap.SYNC_ROW_DEDUPE_SQL:
+            conn.execute(text(statement))
+        tasks = [row[0] for row in conn.execute(text("SELECT id FROM tasks ORDER BY id"))]
+        items = [row[0] for row in conn.execute(text("SELECT id FROM content_items ORDER BY id"))]
+    assert tasks == [1, 3, 4, 5]
+    assert items == [1, 3]
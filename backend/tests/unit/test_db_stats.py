@@ -0,0 +1,39 @@
+import asyncio
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db_stats import current_stats, instrument_engine, stop_tracking, track_request
+
+
+def test_queries_are_counted_per_request_across_threadpool():
+    engine = create_engine("sqlite:///:memory:")
+    instrument_engine(engine)
+    instrument_engine(engine)
+
+    def run_queries(count):
+        with engine.connect() as conn:
+            for _ in range(count):
+                conn.execute(text("select 1"))
+
+    run_queries(2)
+    assert current_stats() is None
+
+    async def handle_request():
+        stats, token = track_request("cid-1")
+        try:
+            await asyncio.to_thread(run_queries, 3)
+            with engine.connect() as conn:
+                try:
+                    conn.execute(text("select * from missing_table"))
+                except OperationalError:
+                    pass
+        finally:
+            stop_tracking(token)
+        return stats
+
+    stats = asyncio.run(handle_request())
+    assert stats.correlation_id == "cid-1"
+    assert stats.queries == 3
+    assert stats.duration_seconds > 0
+    assert current_stats() is None
@@ -0,0 +1,95 @@
+import time
+from pathlib import Path
+
+from app.services.filesystem_watcher import FilesystemWatcher, project_path_for
+
+
+def test_project_path_for_maps_nested_paths_to_project(tmp_path: Path):
+    root = tmp_path / "projects"
+    nested = root / "records" / "night_drive" / "stems" / "kick.wav"
+
+    assert project_path_for(root, str(nested)) == str(root / "records" / "night_drive")
+    assert project_path_for(root, str(root / "records")) is None
+    assert project_path_for(root, str(root / "other" / "thing")) is None
+    assert project_path_for(root, str(tmp_path / "elsewhere")) is None
+
+
+def test_drain_returns_each_dirty_project_once(tmp_path: Path):
+    root = tmp_path / "projects"
+    watcher = FilesystemWatcher(root)
+    watcher.mark_dirty(str(root / "tech" / "app" / "main.py"))
+    watcher.mark_dirty(str(root / "tech" / "app" / "README.md"))
+
+    watcher.mark_dirty(str(root / "tech" / "app" / "src" / "lib.py"))
+    watcher.mark_dirty(str(root / "tech" / "app" / "assets"), directory_changed=True)
+
+    assert watcher.drain() == {str(root / "tech" / "app"): {"", "src", "assets"}}
+    assert watcher.drain() == {}
+
+
+def test_polling_watcher_reports_real_file_writes_outside_ignored_dirs(tmp_path: Path):
+    root = tmp_path / "projects"
+    project = root / "tech" / "app"
+    (project / "src").mkdir(parents=True)
+    (project / "node_modules" / "pkg").mkdir(parents=True)
+    watcher = FilesystemWatcher(root, backend="polling", poll_seconds=0.1)
+    assert watcher.start()
+    try:
+        (project / "node_modules" / "pkg" / "index.js").write_text("module.exports = 1", encoding="utf-8")
+        (project / "src" / "main.py").write_text("print('hi')", encoding="utf-8")
+        dirty = {}
+        deadline = time.monotonic() + 5
+        while str(project) not in dirty and time.monotonic() < deadline:
+            time.sleep(0.1)
+            for path, rel_dirs in watcher.drain().items():
+                dirty.setdefault(path, set()).update(rel_dirs)
+        time.sleep(0.3)
+        for path, rel_dirs in watcher.drain().items():
+            dirty.setdefault(path, set()).update(rel_dirs)
+    finally:
+        watcher.stop()
+
+    assert dirty == {str(project): {"src"}}
+
+
+def test_native_watcher_failure_stops_observer_and_reports_unavailable(tmp_path: Path, monkeypatch):
+    import watchdog.observers
+
+    stopped = []
+
+    class FailingObserver(watchdog.observers.Observer):
+        def start(self):
+            raise OSError(28, "inotify watch limit reached")
+
+        def stop(self):
+            stopped.append(True)
+            super().stop()
+
+    monkeypatch.setattr(watchdog.observers, "Observer", FailingObserver)
+    root = tmp_path / "projects"
+    (root / "tech" / "app").mkdir(parents=True)
+    watcher = FilesystemWatcher(root)
+
+    assert watcher.start() is False
+    assert stopped == [True]
+    watcher.stop()
+
+
+def test_skipped_dirty_run_is_requeued(tmp_path: Path):
+    from app.database import engine
+    from app.services.filesystem_sync import run_filesystem_sync_job
+    from app.services.sync_coordination import scan_lock
+
+    root = tmp_path / "projects"
+    watcher = FilesystemWatcher(root)
+    watcher.mark_dirty(str(root / "tech" / "app" / "src" / "lib.py"))
+    dirty = watcher.drain()
+
+    with scan_lock(engine) as acquired:
+        assert acquired
+        result = run_filesystem_sync_job(dirty, debounce=True)
+    assert result == {"status": "skipped", "reason": "scan_in_progress"}
+
+    watcher.mark_dirty(str(root / "tech" / "app" / "README.md"))
+    watcher.requeue(dirty)
+    assert watcher.drain() == {str(root / "tech" / "app"): {"", "src"}}
@@ -0,0 +1,73 @@
+import threading
+
+from app.services.job_runner import JobRunner
+
+
+def test_submit_returns_queued_job_and_records_result():
+    runner = JobRunner()
+    release = threading.Event()
+
+    job = runner.submit("sync", lambda: release.wait(5) and {"projects_scanned": 2})
+    assert runner.get(job.id).status in {"queued", "running"}
+
+    release.set()
+    job.future.result(timeout=5)
+    state = runner.get(job.id).to_dict()
+    assert state["status"] == "finished"
+    assert state["result"] == {"projects_scanned": 2}
+    assert state["duration_seconds"] is not None
+    runner.shutdown()
+
+
+def test_failed_job_keeps_error_and_history_is_bounded():
+    runner = JobRunner(history_size=2)
+
+    def boom():
+        raise ValueError("scan failed")
+
+    jobs = [runner.submit("sync", boom) for _ in range(3)]
+    for job in jobs:
+        job.future.result(timeout=5)
+    runner.submit("sync", lambda: None).future.result(timeout=5)
+
+    listed = runner.list_jobs()
+    assert len(listed) == 2
+    assert listed[1]["status"] == "failed"
+    assert listed[1]["error"] == "scan failed"
+    runner.shutdown()
+
+
+def test_submit_unique_coalesces_onto_in_flight_job():
+    runner = JobRunner()
+    release = threading.Event()
+
+    first = runner.submit_unique("sync", lambda: release.wait(5) and {"ok": True})
+    second = runner.submit_unique("sync", lambda: {"ok": False})
+    assert second is first
+    assert first.coalesced == 1
+
+    release.set()
+    first.future.result(timeout=5)
+    third = runner.submit_unique("sync", lambda: None)
+    assert third is not first
+    third.future.result(timeout=5)
+    runner.shutdown()
+
+
+def test_submit_unique_only_coalesces_onto_matching_key():
+    runner = JobRunner()
+    release = threading.Event()
+
+    scheduled = runner.submit_unique(
+        "sync", lambda debounce: release.wait(5) and {"debounce": debounce}, debounce=True, coalesce_key="sync:debounced"
+    )
+    manual = runner.submit_unique("sync", lambda debounce: {"debounce": debounce}, debounce=False)
+    again = runner.submit_unique("sync", lambda debounce: None, debounce=False)
+    assert manual is not scheduled
+    assert again is manual
+    assert scheduled.coalesced == 0
+
+    release.set()
+    assert manual.future.result(timeout=5).result == {"debounce": False}
+    assert scheduled.result == {"debounce": True}
+    runner.shutdown()
@@ -0,0 +1,76 @@
+import io
+import json
+import logging
+import threading
+from logging.handlers import RotatingFileHandler
+
+from app.logging.json_logger import QueueJsonHandler
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def test_queue_handler_writes_json_lines_with_extra_payload(tmp_path):
+    stream = io.StringIO()
+    file_handler = RotatingFileHandler(tmp_path / "api.log", maxBytes=400, backupCount=2, encoding="utf-8")
+    handler = QueueJsonHandler(stream=stream, file_handler=file_handler)
+    logger = _logger("test_queue_json", handler)
+
+    for index in range(10):
+        logger.info("request %s", index, extra={"extra": {"correlation_id": f"cid-{index}", "status_code": 200}})
+    handler.close()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == [f"request {index}" for index in range(10)]
+    assert lines[3]["correlation_id"] == "cid-3"
+    assert lines[3]["level"] == "INFO"
+    assert "timestamp" in lines[3]
+    assert (tmp_path / "api.log.1").exists()
+    assert all(path.stat().st_size <= 400 for path in tmp_path.glob("api.log*"))
+
+
+def test_queue_handler_drops_and_reports_when_full():
+    release = threading.Event()
+
+    class SlowStream(io.StringIO):
+        def write(self, data):
+            release.wait(5)
+            return super().write(data)
+
+    stream = SlowStream()
+    handler = QueueJsonHandler(stream=stream, maxsize=2, policy="drop")
+    logger = _logger("test_queue_json_drop", handler)
+
+    for index in range(20):
+        logger.info("event %s", index)
+    dropped = handler.dropped
+    release.set()
+    handler.close()
+
+    assert 0 < dropped <= 18
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[-1]["message"] == "log_records_dropped"
+    assert lines[-1]["dropped_total"] == dropped
+    assert len(lines) == 20 - dropped + 1
+
+
+def test_queue_handler_survives_records_that_fail_to_encode(monkeypatch):
+    monkeypatch.setattr(logging, "raiseExceptions", False)
+    stream = io.StringIO()
+    handler = QueueJsonHandler(stream=stream)
+    logger = _logger("test_queue_json_bad_record", handler)
+
+    logger.info("int keys", extra={"extra": {"counts": {1: "one"}}})
+    logger.info("tuple keys", extra={"extra": {"pairs": {(1, 2): "bad"}}})
+    logger.info("after")
+    handler.close()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == ["int keys", "after"]
+    assert lines[0]["counts"] == {"1": "one"}
+    assert handler.format_errors == 1
@@ -0,0 +1,45 @@
+import threading
+from pathlib import Path
+
+from app.services.memory_journal import MemoryJournal
+
+
+def test_flush_writes_header_once_and_clears_entries(tmp_path: Path):
+    path = tmp_path / "memory" / "overview.md"
+    journal = MemoryJournal(path, "# Overview\n\n")
+    assert journal.flush() is True
+    assert not path.exists()
+
+    journal.add("- one")
+    journal.add("- two")
+    assert journal.flush() is True
+    assert len(journal) == 0
+    journal.add("- three")
+    journal.flush()
+
+    assert path.read_text(encoding="utf-8") == "# Overview\n\n- one\n- two\n- three\n"
+
+
+def test_concurrent_flushes_do_not_interleave(tmp_path: Path):
+    path = tmp_path / "overview.md"
+
+    def run(worker: int):
+        journal = MemoryJournal(path, "# Overview\n\n")
+        for line in range(200):
+            journal.add(f"- worker {worker} line {line}")
+        journal.flush()
+
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[:2] == ["# Overview", ""]
+    body = lines[2:]
+    assert len(body) == 800
+    blocks = [body[i : i + 200] for i in range(0, 800, 200)]
+    for block in blocks:
+        worker = block[0].split()[2]
+        assert block == [f"- worker {worker} line {line}" for line in range(200)]
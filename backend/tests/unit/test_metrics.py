@@ -25,3 +25,148 @@ def test_n8n_sync_requires_env(monkeypatch):
     monkeypatch.setattr(n8n_sync.settings, "n8n_api_key", None)
     result = n8n_sync.sync_n8n_workflows(None)
     assert result["status"] == "skipped"
+
+
+def test_db_gauges_are_aggregated_per_brand_and_status():
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import Base
+    from app.metrics import (
+        CONTENT_ITEMS_BY_BRAND_AND_STATUS,
+        PROJECTS_BY_BRAND_AND_STAGE,
+        TASKS_OPEN_BY_BRAND,
+        update_db_gauges,
+    )
+    from app.models import ContentItem, Project, Task
+    from app.services.brand_service import ensure_brands, get_brand_by_slug
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    ensure_brands(db)
+    tech = get_brand_by_slug(db, "tech")
+    project = Project(brand_id=tech.id, name="gauge", type="web_app", stage=None, status="wip", priority="medium")
+    db.add(project)
+    db.flush()
+    for status in ["open", "open", "done"]:
+        db.add(
+            Task(
+                project_id=project.id,
+                brand_id=tech.id,
+                title=f"task {status}",
+                status=status,
+                priority="medium",
+                source="test",
+                created_by="human",
+                assigned_to="human",
+            )
+        )
+    db.add(ContentItem(brand_id=tech.id, title="teaser", type="teaser", status="idea", source="test"))
+    db.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    update_db_gauges(db)
+
+    assert len(statements) == 4
+    assert TASKS_OPEN_BY_BRAND.labels(brand="tech", status="open")._value.get() == 2
+    assert TASKS_OPEN_BY_BRAND.labels(brand="tech", status="all")._value.get() == 3
+    assert TASKS_OPEN_BY_BRAND.labels(brand="records", status="all")._value.get() == 0
+    assert PROJECTS_BY_BRAND_AND_STAGE.labels(brand="tech", stage="unknown")._value.get() == 1
+    assert CONTENT_ITEMS_BY_BRAND_AND_STATUS.labels(brand="tech", status="idea")._value.get() == 1
+
+
+def test_refresh_db_gauges_records_duration_and_staleness():
+    import math
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import Base
+    from app.metrics import DB_GAUGES_STALENESS, refresh_db_gauges
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+
+    assert refresh_db_gauges(sessionmaker(bind=engine)) is True
+    staleness = next(DB_GAUGES_STALENESS.collect()).samples[0].value
+    assert not math.isnan(staleness) and staleness < 5
+    payload = render_metrics()
+    assert b"db_gauges_refresh_duration_seconds_count" in payload
+
+    def broken_session():
+        raise_engine = create_engine("sqlite:///:memory:")
+        return sessionmaker(bind=raise_engine)()
+
+    assert refresh_db_gauges(broken_session) is False
+    assert b"db_gauges_refresh_failures_total 1.0" in render_metrics()
+
+
+def test_request_metrics_use_route_templates_and_cap_cardinality(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import metrics
+    from app.main import app
+
+    client = TestClient(app)
+    client.get("/")
+    client.get("/scanner/probe/123")
+    client.get("/system/jobs/abc")
+    payload = render_metrics().decode()
+    assert 'path="/"' in payload
+    assert f'path="{metrics.UNMATCHED_PATH_LABEL}"' in payload
+    assert 'path="/system/jobs/{job_id}"' in payload
+    assert "/scanner/probe/123" not in payload
+
+    monkeypatch.setattr(metrics, "_path_labels", set())
+    monkeypatch.setattr(metrics.settings, "metrics_path_label_limit", 1)
+    assert metrics.route_path_label({}) == metrics.UNMATCHED_PATH_LABEL
+    assert metrics.route_path_label({"route": app.routes[-1]}) == metrics.OVERFLOW_PATH_LABEL
+    assert metrics.HTTP_PATH_LABEL_OVERFLOW_TOTAL._value.get() >= 1
+    assert metrics.method_label("PROPFIND") == "OTHER"
+
+
+def test_multiprocess_mode_aggregates_worker_files(tmp_path):
+    import os
+    import runpy
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    backend = Path(__file__).resolve().parents[2]
+    record = (
+        "from app.metrics import record_request, TASKS_OPEN_BY_BRAND\n"
+        "record_request('GET', '/', 200, 0.01)\n"
+        "TASKS_OPEN_BY_BRAND.labels(brand='tech', status='all').set(7)\n"
+    )
+    pids = []
+    for _ in range(2):
+        proc = subprocess.run(
+            [sys.executable, "-c", record + "import os; print(os.getpid())"],
+            cwd=backend,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        pids.append(int(proc.stdout.strip()))
+    render = "from app.metrics import render_metrics; print(render_metrics().decode())"
+    output = subprocess.run(
+        [sys.executable, "-c", render], cwd=backend, env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert 'http_requests_total{method="GET",path="/",status_code="200"} 2.0' in output
+    assert 'tasks_open_by_brand{brand="tech",status="all"} 7.0' in output
+    assert "db_gauges_staleness_seconds" in output
+
+    hooks = runpy.run_path(str(backend / "gunicorn.conf.py"))
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(tmp_path)
+    try:
+        for pid in pids:
+            hooks["child_exit"](None, type("Worker", (), {"pid": pid}))
+    finally:
+        del os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    assert not list(tmp_path.glob("gauge_livemostrecent_*.db"))
+    assert list(tmp_path.glob("counter_*.db"))
@@ -0,0 +1,63 @@
+import importlib.util
+import json
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, text
+
+VERSIONS = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+
+def _upgrade(conn, name):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with Operations.context(MigrationContext.configure(conn)):
+        module.upgrade()
+
+
+def test_project_path_migration_merges_duplicates_with_shared_sync_tasks(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    with engine.begin() as conn:
+        _upgrade(conn, "001_initial")
+        _upgrade(conn, "002_add_project_stage")
+        conn.execute(text("INSERT INTO brands (id, name, slug) VALUES (1, 'Tech', 'tech')"))
+        a = json.dumps({"filesystem_path": "/p/tech/a"})
+        conn.execute(
+            text(
+                """
+                INSERT INTO projects (id, brand_id, name, type, status, priority, meta) VALUES
+                (1, 1, 'a', 'app', 'active', 'medium', :a),
+                (2, 1, 'a', 'app', 'active', 'medium', :a),
+                (3, 1, 'a', 'app', 'active', 'medium', :a),
+                (4, 1, 'b', 'app', 'active', 'medium', :b)
+                """
+            ),
+            {"a": a, "b": json.dumps({"filesystem_path": "/p/tech/b"})},
+        )
+        tasks = [
+            (1, 1, "Add README for project", "filesystem_sync"),
+            (2, 2, "Add README for project", "filesystem_sync"),
+            (3, 3, "Add README for project", "filesystem_sync"),
+            (4, 2, "Add tests", "filesystem_sync"),
+            (5, 3, "Add tests", "filesystem_sync"),
+            (6, 2, "Call the label", "manual"),
+            (7, 4, "Add README for project", "filesystem_sync"),
+        ]
+        for task_id, project_id, title, source in tasks:
+            conn.execute(
+                text(
+                    "INSERT INTO tasks (id, project_id, brand_id, title, status, priority, source, created_by, "
+                    "assigned_to) VALUES (:id, :project_id, 1, :title, 'open', 'medium', :source, 'agent', 'human')"
+                ),
+                {"id": task_id, "project_id": project_id, "title": title, "source": source},
+            )
+
+        _upgrade(conn, "003_filesystem_sync_unique_rows")
+        _upgrade(conn, "004_project_filesystem_path")
+
+        paths = dict(conn.execute(text("SELECT id, filesystem_path FROM projects")).all())
+        remaining = dict(conn.execute(text("SELECT id, project_id FROM tasks")).all())
+    assert paths == {1: "/p/tech/a", 2: None, 3: None, 4: "/p/tech/b"}
+    assert remaining == {1: 1, 4: 1, 6: 1, 7: 4}
@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from app.metrics import RATE_LIMIT_EVICTIONS_TOTAL
+from app.services import rate_limiter
+from app.services.rate_limiter import MemoryBackend, RateLimit, RateLimiter, RedisBackend, load_routes
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_and_reports_retry_after():
+    clock = FakeClock()
+    limiter = RateLimiter({"/auth/login": RateLimit("login", 2)}, MemoryBackend(clock=clock))
+
+    assert limiter.check("/auth/login", "1.2.3.4") is None
+    assert limiter.check("/auth/login", "1.2.3.4") is None
+    assert limiter.check("/auth/login", "1.2.3.4") == pytest.approx(30.0)
+    assert limiter.check("/auth/login", "5.6.7.8") is None
+    assert limiter.check("/ideas", "1.2.3.4") is None
+
+    clock.now += 30
+    assert limiter.check("/auth/login", "1.2.3.4") is None
+    assert limiter.check("/auth/login", "1.2.3.4") is not None
+
+
+def test_memory_backend_evicts_least_recently_seen_clients():
+    backend = MemoryBackend(max_keys=2, clock=FakeClock())
+    limit = RateLimit("login", 1)
+    before = RATE_LIMIT_EVICTIONS_TOTAL._value.get()
+
+    assert backend.hit("a", limit)[0]
+    assert backend.hit("b", limit)[0]
+    assert not backend.hit("a", limit)[0]
+    assert backend.hit("c", limit)[0]
+
+    assert len(backend) == 2
+    assert not backend.hit("a", limit)[0]
+    assert backend.hit("b", limit)[0]
+    assert RATE_LIMIT_EVICTIONS_TOTAL._value.get() - before == 2
+
+
+def test_load_routes_maps_paths_to_named_limits():
+    routes = load_routes(
+        {
+            "limits": {"login": 10, "burst": {"requests": 5, "period_seconds": 1}},
+            "routes": {"/auth/login": "login", "/ideas": "burst"},
+        }
+    )
+    assert routes["/auth/login"] == RateLimit("login", 10, 60.0)
+    assert routes["/ideas"].refill_per_second == 5
+
+    with pytest.raises(ValueError):
+        load_routes({"limits": {}, "routes": {"/ideas": "missing"}})
+
+
+def test_redis_backend_fails_open():
+    class UnreachableRedis:
+        def register_script(self, source):
+            def run(keys, args):
+                raise ConnectionError("connection refused")
+
+            return run
+
+    backend = RedisBackend("redis://localhost:6379/0", client=UnreachableRedis())
+    assert backend.hit("login:1.2.3.4", RateLimit("login", 1)) == (True, 0.0)
+
+
+def test_redis_backend_runs_token_bucket_script():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    client = fakeredis.FakeRedis()
+    backend = RedisBackend("redis://fake", client=client)
+    limit = RateLimit("login", 3, period_seconds=2)
+    key = "43v3r:ratelimit:login:1.2.3.4"
+
+    for _ in range(3):
+        assert backend.hit("login:1.2.3.4", limit) == (True, 0.0)
+    allowed, retry_after = backend.hit("login:1.2.3.4", limit)
+    assert not allowed
+    assert 0.5 < retry_after <= 2 / 3
+    assert backend.hit("login:5.6.7.8", limit)[0]
+
+    assert float(client.hget(key, "tokens")) < 1
+    assert 2000 < client.pttl(key) <= 3000
+
+    time.sleep(retry_after + 0.05)
+    assert backend.hit("login:1.2.3.4", limit)[0]
+    assert not backend.hit("login:1.2.3.4", limit)[0]
+
+
+def test_missing_config_falls_back_to_default_limits(tmp_path):
+    limiter = rate_limiter.load_rate_limiter(tmp_path / "missing.yaml")
+    assert limiter.routes["/ideas"] == RateLimit("ideas_ingest_per_minute", 30)
+    assert limiter.routes["/auth/login"] == RateLimit("auth_login_per_minute", 10)
+
+
+def test_middleware_returns_429_with_retry_after():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.middleware import RequestMiddleware
+
+    app = FastAPI()
+    limiter = RateLimiter({"/limited": RateLimit("test", 1)}, MemoryBackend())
+    app.add_middleware(RequestMiddleware, rate_limiter=limiter)
+    client = TestClient(app)
+
+    assert client.get("/limited").status_code == 404
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Rate limit exceeded"}
+    assert response.headers["retry-after"] == "60"
@@ -0,0 +1,46 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.metrics import HTTP_REQUESTS_TOTAL
+from app.middleware import RequestMiddleware, logger
+from app.services.rate_limiter import MemoryBackend, RateLimiter
+
+
+def test_request_middleware_logs_and_records_by_route():
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    def get_thing(thing_id: int):
+        return {"id": thing_id}
+
+    app.add_middleware(RequestMiddleware, rate_limiter=RateLimiter({}, MemoryBackend()))
+    client = TestClient(app)
+    counter = HTTP_REQUESTS_TOTAL.labels(method="GET", path="/things/{thing_id}", status_code="200")
+    before = counter._value.get()
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+    try:
+        response = client.get("/things/7", headers={"x-correlation-id": "cid-7"})
+        generated = client.get("/things/8")
+    finally:
+        logger.removeHandler(handler)
+
+    assert response.json() == {"id": 7}
+    assert response.headers["x-correlation-id"] == "cid-7"
+    assert generated.headers["x-correlation-id"]
+    assert counter._value.get() - before == 2
+
+    assert [record.getMessage() for record in records] == ["request", "request"]
+    assert records[0].extra == {
+        "correlation_id": "cid-7",
+        "method": "GET",
+        "path": "/things/7",
+        "status_code": 200,
+        "db_queries": 0,
+        "db_time_ms": 0.0,
+    }
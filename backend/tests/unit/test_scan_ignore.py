@@ -0,0 +1,24 @@
+from app.services.scan_ignore import IgnoreRules, build_rules
+
+
+def test_gitignore_style_patterns():
+    rules = IgnoreRules(["# comment", "build/", "*.log", "docs/generated/", "**/cache/**", "!keep.log"])
+
+    assert rules.ignored("build", is_dir=True)
+    assert rules.ignored("src/build", is_dir=True)
+    assert not rules.ignored("build", is_dir=False)
+    assert rules.ignored("logs/run.log", is_dir=False)
+    assert not rules.ignored("keep.log", is_dir=False)
+    assert rules.ignored("docs/generated", is_dir=True)
+    assert not rules.ignored("src/docs/generated", is_dir=True)
+    assert rules.ignored("a/cache/b", is_dir=True)
+
+
+def test_brand_defaults_and_config_extras():
+    rules = build_rules("records", {"brands": {"records": ["Stems/"]}})
+
+    assert rules.ignored("Backup", is_dir=True)
+    assert rules.ignored("Stems", is_dir=True)
+    assert not rules.ignored("node_modules", is_dir=True)
+    assert build_rules("records", {"use_defaults": False}).patterns == []
+    assert rules.digest != build_rules("records", {}).digest
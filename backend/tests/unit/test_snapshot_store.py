@@ -0,0 +1,40 @@
+import json
+from pathlib import Path
+
+from app.services.snapshot_store import SnapshotStore
+
+
+def _descriptor(path: str, fingerprint: str) -> dict:
+    return {
+        "path": path,
+        "brand": "tech",
+        "name": Path(path).name,
+        "fingerprint": fingerprint,
+        "files": ["README.md"],
+        "tree": {"hash": fingerprint, "dirs": {}},
+    }
+
+
+def test_apply_upserts_and_deletes_per_project(tmp_path: Path):
+    with SnapshotStore(tmp_path / "snapshot.db") as store:
+        store.apply([_descriptor("/p/tech/a", "1"), _descriptor("/p/tech/b", "2")], [], "t1")
+        store.apply([_descriptor("/p/tech/a", "3")], ["/p/tech/b"], "t2")
+
+        assert store.index() == {
+            "/p/tech/a": {"path": "/p/tech/a", "brand": "tech", "name": "a", "fingerprint": "3"}
+        }
+        assert store.tree("/p/tech/a") == {"hash": "3", "dirs": {}}
+        assert "files" not in store.get("/p/tech/a")
+        assert store.last_scan() == "t2"
+
+
+def test_legacy_json_snapshot_is_imported_once(tmp_path: Path):
+    legacy = tmp_path / "snapshot.json"
+    legacy.write_text(
+        json.dumps({"last_scan": "t0", "projects": {"/p/tech/a": _descriptor("/p/tech/a", "1")}}),
+        encoding="utf-8",
+    )
+    with SnapshotStore(tmp_path / "snapshot.db", legacy) as store:
+        store.apply([], ["/p/tech/a"], "t1")
+    with SnapshotStore(tmp_path / "snapshot.db", legacy) as store:
+        assert store.index() == {}
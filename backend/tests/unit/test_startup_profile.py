@@ -0,0 +1,46 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.startup_profile import StartupProfile
+
+
+def test_startup_profile_times_sync_and_async_hooks():
+    profile = StartupProfile()
+
+    @profile.hook
+    def seed():
+        return "seeded"
+
+    @profile.hook
+    async def start_loop():
+        return "started"
+
+    assert seed() == "seeded"
+    assert asyncio.run(start_loop()) == "started"
+    with profile.step("deferred", "ensure_brands"):
+        pass
+
+    report = profile.report(["startup"])
+    assert [step["name"] for step in report["steps"]] == ["seed", "start_loop"]
+    assert report["elapsed_ms"] >= 0
+    assert len(profile.report()["steps"]) == 3
+
+
+def test_importing_app_does_not_load_heavy_dependencies():
+    code = (
+        "import sys\n"
+        "import app.main\n"
+        "print(sorted(m for m in ('langgraph', 'passlib', 'httpx') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[2],
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
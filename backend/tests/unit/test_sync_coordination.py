@@ -0,0 +1,24 @@
+from sqlalchemy import create_engine
+
+from app.services.sync_coordination import LeaderElection, scan_lock
+
+
+def test_scan_lock_is_exclusive_until_released():
+    engine = create_engine("sqlite:///:memory:")
+    with scan_lock(engine) as first:
+        with scan_lock(engine) as second:
+            assert first is True
+            assert second is False
+    with scan_lock(engine) as again:
+        assert again is True
+
+
+def test_leader_election_hands_over_on_resign():
+    engine = create_engine("sqlite:///:memory:")
+    leader = LeaderElection(engine, key=1)
+    follower = LeaderElection(engine, key=1)
+    assert leader.ensure() is True
+    assert follower.ensure() is False
+    leader.resign()
+    assert follower.ensure() is True
+    follower.resign()